@@ -0,0 +1,93 @@
+"""Time one round of zombie game output through enforce_bullets.
+
+Run from the liza_bot directory:
+
+    python bench/bench_formatting.py [repeats]
+
+``legacy_bold_character_names`` and ``legacy_enforce_bullets`` are the
+versions from before NAME_PATTERN: one re.sub per name, twice, for every
+bullet.
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.fakes import install_stand_ins  # noqa: E402
+
+install_stand_ins()
+
+from cogs import zombie_game  # noqa: E402
+
+CHARACTER_INFO = zombie_game.CHARACTER_INFO
+VERBS = ["barricades the door with", "argues with", "shares rations with", "scouts ahead of", "whispers to"]
+SECTION_LINES = (6, 13, 6, 3, 2, 6, 3)  # Scene, health, dynamics, dilemma, choices, outcome, deaths
+
+
+def legacy_bold_character_names(text: str) -> str:
+    all_names = []
+    for name in CHARACTER_INFO.keys():
+        all_names.append(name)
+        all_names.append(name.split()[0])
+    all_names = sorted(set(all_names), key=len, reverse=True)
+    for name in all_names:
+        text = re.sub(rf'\b({re.escape(name)})[\'’]s\b', rf"**\1**'s", text)
+    for name in all_names:
+        text = re.sub(rf'\b{re.escape(name)}\b', f"**{name}**", text)
+    return text
+
+
+def legacy_enforce_bullets(text: str) -> list:
+    bullets = []
+    current = ""
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.startswith(('•', '-', '*')):
+            stripped = stripped[1:].strip()
+        contains_name = any(name.split()[0] in stripped for name in CHARACTER_INFO)
+        if contains_name or (current and len(current) > 100):
+            if current:
+                bullets.append(f"• {legacy_bold_character_names(current.strip())}")
+                current = ""
+            bullets.append(f"• {legacy_bold_character_names(stripped)}")
+        else:
+            current = current + " " + stripped if current else stripped
+    if current:
+        bullets.append(f"• {legacy_bold_character_names(current.strip())}")
+    return bullets
+
+
+def make_round(rng: random.Random) -> list:
+    def line():
+        first, second = rng.sample(zombie_game.CHARACTERS, 2)
+        first = first if rng.random() < 0.5 else first.split()[0]
+        return f"- {first} {rng.choice(VERBS)} {second.split()[0]}'s group while the horde presses against the fence."
+    return ["\n".join(line() for _ in range(count)) for count in SECTION_LINES]
+
+
+def per_round_ms(enforce, sections: list, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for text in sections:
+            enforce(text)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    sections = make_round(random.Random(1))
+    print(f"one round: {sum(SECTION_LINES)} lines, {repeats} repeats")
+    print(f"legacy     {per_round_ms(legacy_enforce_bullets, sections, repeats):6.2f} ms per round")
+    print(f"current    {per_round_ms(zombie_game.enforce_bullets, sections, repeats):6.2f} ms per round")
+    sample = "Shaun's knife. Shaun Sadsarin runs. Addison Sadsarin’s bag. **Gabe** waits."
+    print(f"legacy:  {legacy_bold_character_names(sample)}")
+    print(f"current: {zombie_game.bold_character_names(sample)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compare media detection before and after the shared classifier.
+
+Run from the liza_bot directory:
+
+    python bench/bench_media_classifier.py [messages]
+
+``legacy_contains_media`` is the detection message_pull used before
+media_classifier existed. Each corpus is timed three ways: the "any media"
+check, the video check, and both on the same message, which is what
+building an index row does.
+"""
+import os
+import random
+import re
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs import media_classifier  # noqa: E402
+
+LEGACY_MEDIA_DOMAINS = [
+    "drive.google.com", "photos.google.com", "imgur.com",
+    "tenor.com", "giphy.com", "media.discordapp.net", "cdn.discordapp.com"
+]
+CHAT = [
+    "lol", "did you see that", "omg " * 20, "hey" * 5, "wait what",
+    "no way", "gg", "that was so funny honestly", "ok", "brb"
+]
+LINKS = [
+    "https://tenor.com/view/cat-123",
+    "check https://youtube.com/watch?v=1 out",
+    "https://i.imgur.com/abc.png nice",
+    "https://cdn.discordapp.com/attachments/1/2/a.mp4",
+    "https://example.com/page",
+]
+
+
+def legacy_contains_media(msg, media_type=None) -> bool:
+    if media_type == "video":
+        for attachment in msg.attachments:
+            if attachment.content_type and "video" in attachment.content_type:
+                return True
+        urls = re.findall(r"https?://\S+", msg.content)
+        return any("video" in url.lower() or "mp4" in url.lower() or "gifv" in url.lower() for url in urls)
+    if msg.attachments:
+        return True
+    urls = re.findall(r"https?://\S+", msg.content)
+    return any(domain in url for url in urls for domain in LEGACY_MEDIA_DOMAINS)
+
+
+def new_contains_media(msg, media_type=None) -> bool:
+    info = media_classifier.classify_message(msg)
+    return info.has_video if media_type == "video" else info.kind is not None
+
+
+def make_messages(texts: list, count: int) -> list:
+    rng = random.Random(1)
+    attachment = SimpleNamespace(content_type="image/png", url="https://cdn.discordapp.com/x.png")
+    return [
+        SimpleNamespace(
+            id=i, edited_at=None, content=rng.choice(texts),
+            attachments=[attachment] if rng.random() < 0.05 else []
+        )
+        for i in range(count)
+    ]
+
+
+def timed(check, msgs: list) -> tuple:
+    media_classifier._cache.clear()
+    start = time.perf_counter()
+    result = [check(m) for m in msgs]
+    return time.perf_counter() - start, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    patterns = {
+        "any": lambda f: (lambda m: f(m)),
+        "video": lambda f: (lambda m: f(m, "video")),
+        "index row": lambda f: (lambda m: (f(m), f(m, "video"))),
+    }
+    corpora = {"chat": CHAT * 9 + LINKS, "links": LINKS}
+    print(f"{count} messages per corpus")
+    for corpus, texts in corpora.items():
+        msgs = make_messages(texts, count)
+        for pattern, wrap in patterns.items():
+            old_time, old_result = timed(wrap(legacy_contains_media), msgs)
+            new_time, new_result = timed(wrap(new_contains_media), msgs)
+            agree = "agree" if old_result == new_result else "DISAGREE"
+            print(f"{corpus:6s} {pattern:10s} legacy {old_time:6.2f}s  classifier {new_time:6.2f}s  {agree}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Time stat and relationship tracking over synthetic zombie rounds.
+
+Run from the liza_bot directory:
+
+    python bench/bench_tracking.py [rounds]
+
+``legacy_track_stats`` and ``legacy_track_relationships`` are the versions
+from before TRACKING_PATTERN: four regexes per character for stats and two
+per ordered pair of survivors for relationships. There are no saved game
+transcripts in the tree, so the rounds are generated. The counts printed
+differ on purpose: the old patterns ran on past the end of a sentence.
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.fakes import install_stand_ins  # noqa: E402
+
+install_stand_ins()
+
+from cogs import zombie_game  # noqa: E402
+
+CHARACTER_INFO = zombie_game.CHARACTER_INFO
+VERBS = ["helps", "protects", "argues with", "shares water with", "confronts",
+         "scavenges near", "stays calm beside", "attacks a walker near", "trusts"]
+FILLER = "Rain hammers the broken skylight while the horde claws at the boarded windows and the generator sputters"
+
+
+def legacy_track_stats(text: str, g):
+    for name in CHARACTER_INFO:
+        if re.search(rf"{name}.*(help|assist|protect|save|heal|aid|support)", text, re.IGNORECASE):
+            g.stats["helped"][name] += 1
+        if re.search(rf"{name}.*(improvise|solve|navigate|strategize|craft|build|repair|scavenge|plan)", text, re.IGNORECASE):
+            g.stats["resourceful"][name] += 1
+        if re.search(rf"{name}.*(betray|attack|abandon|sabotage|threaten|steal|harm|endanger)", text, re.IGNORECASE):
+            g.stats["sinister"][name] += 1
+        if re.search(rf"{name}.*(grace|sacrifice|honor|calm|composure|dignity|bravery|courage)", text, re.IGNORECASE):
+            g.stats["dignified"][name] += 1
+
+
+def legacy_track_relationships(text: str, g):
+    for name1 in g.alive:
+        for name2 in g.alive:
+            if name1 == name2:
+                continue
+            if re.search(rf"{name1}.*(share|nod|exchange|trust|help|protect|comfort|support).+{name2}", text, re.IGNORECASE):
+                g.stats["bonds"][(name1, name2)] += 1
+            if re.search(rf"{name1}.*(argue|fight|oppose|resent|blame|distrust|confront|attack).+{name2}", text, re.IGNORECASE):
+                g.stats["conflicts"][(name1, name2)] += 1
+
+
+def sentence(rng: random.Random) -> str:
+    first, second = rng.sample(zombie_game.CHARACTERS, 2)
+    return f"{first} {rng.choice(VERBS)} {second}. {FILLER}."
+
+
+def make_round(rng: random.Random) -> list:
+    """Scene, health and dilemma text: 4, 3 and 2 paragraphs of 4 sentences."""
+    return ["\n\n".join(" ".join(sentence(rng) for _ in range(4)) for _ in range(paragraphs))
+            for paragraphs in (4, 3, 2)]
+
+
+def run(track_stats, track_relationships, rounds: list) -> tuple:
+    g = zombie_game.GameState(1)
+    start = time.perf_counter()
+    for scene, health, dilemma in rounds:
+        track_relationships(scene, g)
+        track_stats(health, g)
+        track_stats(dilemma, g)
+    elapsed = (time.perf_counter() - start) / len(rounds) * 1000
+    counts = {name: sum(g.stats[name].values()) for name in ("helped", "bonds", "conflicts")}
+    return elapsed, counts
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rng = random.Random(3)
+    rounds = [make_round(rng) for _ in range(count)]
+    print(f"{count} rounds")
+    for label, track_stats, track_relationships in (
+        ("legacy", legacy_track_stats, legacy_track_relationships),
+        ("current", zombie_game.auto_track_stats, zombie_game.auto_track_relationships),
+    ):
+        elapsed, counts = run(track_stats, track_relationships, rounds)
+        print(f"{label:8s} {elapsed:6.2f} ms per round  {counts}")
+    print("single scene text:")
+    for scale in (1, 4, 16):
+        text = " ".join(sentence(rng) for _ in range(12 * scale))
+        g = zombie_game.GameState(1)
+        start = time.perf_counter()
+        for _ in range(3):
+            legacy_track_relationships(text, g)
+        legacy = (time.perf_counter() - start) / 3
+        start = time.perf_counter()
+        for _ in range(20):
+            zombie_game.auto_track_relationships(text, g)
+        current = (time.perf_counter() - start) / 20
+        print(f"{len(text):6d} chars  legacy {legacy * 1000:7.2f} ms  current {current * 1000:6.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import re
+import random
+from collections import namedtuple
+from typing import Iterable
+
+# Checked most severe first; a status with no keyword is 🟢
+SEVERITY_KEYWORDS = (
+    ("🔴", ("critical", "dying", "bleeding", "unconscious", "fever", "submerged", "unseen")),
+    ("🟡", ("hurt", "wounded", "injured", "weak", "tired", "exhausted", "panicked")),
+)
+DEFAULT_ICON = "🟢"
+DEFAULT_STATUSES = ("Stable", "Alert", "Tired")
+
+# One line of the health report; reported is False for characters the AI left out
+HealthRecord = namedtuple("HealthRecord", ["name", "status", "icon", "reported"])
+
+
+class HealthReportParser:
+    """Turns the AI's bulleted health report into one record per living character.
+
+    Names (full or first, any case) are found with a single precompiled
+    alternation and severity with one pattern per icon, so a report is
+    parsed in one pass over its lines.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.lookup = {n.lower(): name for name in names for n in (name, name.split()[0])}
+        self.name_pattern = re.compile(
+            r"\b(" + "|".join(map(re.escape, sorted(self.lookup, key=len, reverse=True))) + r")\b",
+            re.IGNORECASE
+        )
+        self.severity_patterns = [
+            (icon, re.compile(r"\b(?:" + "|".join(keywords) + r")", re.IGNORECASE))
+            for icon, keywords in SEVERITY_KEYWORDS
+        ]
+
+    def classify(self, status: str) -> str:
+        for icon, pattern in self.severity_patterns:
+            if pattern.search(status):
+                return icon
+        return DEFAULT_ICON
+
+    def clean_status(self, status: str) -> str:
+        """First word capitalized, the rest lower case except character names."""
+        words = status.split()
+        if not words:
+            return ""
+        rest = [word if word.strip(".,;:!?'’").lower() in self.lookup else word.lower() for word in words[1:]]
+        return " ".join([words[0].capitalize()] + rest)
+
+    def parse_line(self, line: str, alive: set):
+        """(name, status) for a bullet about a living character, else None."""
+        name = None
+        for match in self.name_pattern.finditer(line):
+            candidate = self.lookup[match.group(1).lower()]
+            if candidate in alive:
+                name = candidate
+                break
+        if name is None:
+            return None
+        # Drop the subject's own name; other characters stay ("Worried about Jill")
+        status = self.name_pattern.sub(
+            lambda match: "" if self.lookup[match.group(1).lower()] == name else match.group(0), line
+        ).strip().lstrip(":").strip()
+        return name, self.clean_status(status)
+
+    def parse(self, text: str, alive: Iterable[str]) -> list:
+        """Records in report order, then defaults for anyone the report skipped."""
+        alive = list(alive)
+        alive_set = set(alive)
+        records = {}
+        for line in text.split("\n"):
+            line = line.strip()
+            if not line.startswith("•"):
+                continue
+            parsed = self.parse_line(line.lstrip("•").strip(), alive_set)
+            if parsed is None or parsed[0] in records:
+                continue
+            name, status = parsed
+            status = status or random.choice(DEFAULT_STATUSES)
+            records[name] = HealthRecord(name, status, self.classify(status), True)
+        for name in alive:
+            if name not in records:
+                records[name] = HealthRecord(name, random.choice(DEFAULT_STATUSES), DEFAULT_ICON, False)
+        return list(records.values())
@@ -1,24 +1,21 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import re, random, requests, os, json
+import re, random, os, json
+import asyncio
+import time
+import httpx
+from collections import defaultdict, deque
+from typing import Optional
 from dotenv import load_dotenv
 import logging
+from cogs.openrouter_keys import key_pool, NoKeysAvailable
+from cogs.streaming import TextStream, LiveMessage, StreamError, stream_completion
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Load API keys
-OPENROUTER_API_KEYS = [
-    os.getenv("OPENROUTER_API_KEY_1"),
-    os.getenv("OPENROUTER_API_KEY_2"),
-    os.getenv("OPENROUTER_API_KEY_3"),
-    os.getenv("OPENROUTER_API_KEY_4"),
-    os.getenv("OPENROUTER_API_KEY_5"),
-    os.getenv("OPENROUTER_API_KEY_6"),
-]
-
 BOT_CHANNEL_ID = 1271294510164607008  # Original Liza channel
 COMMAND_CHANNEL_ID = 1451423055426355220  # New channel for !lizaai command
 OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
@@ -34,13 +31,79 @@ RELIABLE_MODELS = [
     "mistralai/mistral-7b-instruct:free"
 ]
 
+# Shared connection pool for OpenRouter calls
+HTTP_LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=60)
+
+# Hedged requests: if the leading model hasn't answered within its p95 latency
+# (never more than LIZA_HEDGE_DELAY seconds), the next model is raced against it
+HEDGE_DELAY = float(os.getenv("LIZA_HEDGE_DELAY", "8"))
+MAX_HEDGED_REQUESTS = 2  # Model requests in flight at once
+LATENCY_WINDOW = 50  # Recent latencies kept per model
+MIN_LATENCY_SAMPLES = 5  # Below this, HEDGE_DELAY is the budget
+
+# Stream replies into Discord as they generate; the hedging race is then won
+# by the first model to produce text, and latencies are time to first token
+LIZA_STREAMING = os.getenv("LIZA_STREAMING", "1").lower() in ("1", "true", "yes")
+
+def openrouter_headers(api_key: str) -> dict:
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "HTTP-Referer": "https://discord.com",
+        "X-Title": "Liza Toddler Bot"
+    }
+
+class ModelStats:
+    """Rolling latency and success record for one model."""
+
+    def __init__(self):
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.successes = 0
+        self.failures = 0
+
+    def record(self, ok: bool, latency: Optional[float] = None):
+        if ok:
+            self.successes += 1
+            self.latencies.append(latency)
+        else:
+            self.failures += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if len(self.latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[int(fraction * (len(ordered) - 1))]
+
+    def hedge_delay(self) -> float:
+        p95 = self.percentile(0.95)
+        return HEDGE_DELAY if p95 is None else min(p95, HEDGE_DELAY)
+
+    def sort_key(self) -> tuple:
+        # Healthier first (failure rate in 10% buckets), then faster; untried
+        # models count as healthy and HEDGE_DELAY-slow
+        attempts = self.successes + self.failures
+        failure_rate = self.failures / attempts if attempts else 0.0
+        median = self.percentile(0.5)
+        return (round(failure_rate, 1), HEDGE_DELAY if median is None else median)
+
 class LizaAI(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.http = None  # httpx.AsyncClient, opened in cog_load
+        self.model_stats = defaultdict(ModelStats)
         print("[LizaAI] Cog initialized!")
         print(f"[LizaAI] Listening in channels: {BOT_CHANNEL_ID} (mentions) and {COMMAND_CHANNEL_ID} (!lizaai)")
         print(f"[LizaAI] Using model: {MODEL}")
 
+    async def cog_load(self):
+        # One async client for the cog's lifetime: keep-alive connections are
+        # reused across replies and a slow model no longer blocks the event loop
+        self.http = httpx.AsyncClient(limits=HTTP_LIMITS, timeout=30)
+
+    async def cog_unload(self):
+        if self.http:
+            await self.http.aclose()
+
     def liza_personality(self, message_content, username):
         moods = [
             "Liza is bouncing on the couch and giggling!",
@@ -63,6 +126,180 @@ class LizaAI(commands.Cog):
             f"Reply in a creative toddler voice using silly logic, giggles, and made-up words. Replies should feel spontaneous and different every time."
         )
 
+    def ordered_models(self) -> list:
+        """Configured model first, then backups; stats reorder them (stable for ties)."""
+        models = list(dict.fromkeys([MODEL] + RELIABLE_MODELS))
+        return sorted(models, key=lambda m: self.model_stats[m].sort_key())
+
+    async def open_reply_stream(self, payload: dict, headers: dict) -> Optional[TextStream]:
+        """Start a streaming call; returns its TextStream once text arrives, None if it ends empty."""
+        stream = TextStream()
+        stream.task = asyncio.create_task(stream_completion(self.http, OPENROUTER_URL, payload, headers, stream))
+        stream.task.add_done_callback(lambda task: stream.finish())
+        first_text = asyncio.create_task(stream.started.wait())
+        try:
+            await asyncio.wait({stream.task, first_text}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            first_text.cancel()
+            if not stream.started.is_set():
+                stream.cancel()  # Failed, empty or cancelled (lost the race)
+        if stream.started.is_set():
+            return stream
+        stream.task.result()  # Raises the request's error, if any
+        return None
+
+    async def request_model(self, model: str, prompt: str, headers: dict):
+        """One OpenRouter call. Returns the reply, or None if the model is missing or empty.
+
+        With LIZA_STREAMING the reply is a TextStream, returned as soon as the
+        first text arrives.
+        """
+        payload = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 1.3,
+            "top_p": 0.9,
+            "max_tokens": 140
+        }
+        stats = self.model_stats[model]
+        print(f"🚀 Sending request to OpenRouter with model: {model}")
+        start = time.monotonic()
+        try:
+            if LIZA_STREAMING:
+                stream = await self.open_reply_stream(payload, headers)
+                if stream is None:
+                    print(f"❌ Empty stream from {model}")
+                    stats.record(False)
+                    return None
+                print(f"📡 {model} started streaming in {time.monotonic() - start:.2f}s")
+                stats.record(True, time.monotonic() - start)
+                return stream
+            response = await self.http.post(OPENROUTER_URL, headers=headers, json=payload, timeout=30)
+            print(f"📡 {model} responded {response.status_code} in {time.monotonic() - start:.2f}s")
+            if response.status_code == 404:
+                print(f"❌ Model {model} not found, trying next...")
+                stats.record(False)
+                return None
+            response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                print(f"❌ Model {model} not found, trying next...")
+                stats.record(False)
+                return None
+            if e.response.status_code not in (401, 429):  # Key problems aren't the model's fault
+                stats.record(False)
+            raise
+        except (httpx.HTTPError, ValueError, StreamError):
+            stats.record(False)
+            raise
+        if "choices" in data and len(data["choices"]) > 0:
+            stats.record(True, time.monotonic() - start)
+            return data["choices"][0]["message"]["content"].strip()
+        print(f"❌ No choices in response from {model}: {data}")
+        stats.record(False)
+        return None
+
+    async def fetch_liza_reply(self, prompt: str):
+        """Race models for a reply: the first answer wins and the rest are cancelled.
+
+        Models start one at a time in ``ordered_models`` order. A model that
+        fails hands over to one next model straight away; one that is slower
+        than its hedge delay gets the next model raced alongside it. Timeouts and
+        5xx errors move on to the next model. A 401/429 is reported to the
+        shared key pool and the model is retried on another key; once no key
+        is left the error is raised as before. Returns None when no model
+        answers, and a still-streaming TextStream with LIZA_STREAMING.
+        """
+        api_key = await key_pool.wait_for_key()
+        print(f"🔑 Using API key (first 10 chars): {api_key[:10]}...")
+        models = deque(self.ordered_models())
+        in_flight = {}  # task -> (model, key)
+        last_error = None
+
+        def launch(model: Optional[str] = None) -> bool:
+            if model is None:
+                if not models:
+                    return False
+                model = models.popleft()
+            print(f"🤖 Trying model: {model}")
+            task = asyncio.create_task(self.request_model(model, prompt, openrouter_headers(api_key)))
+            in_flight[task] = (model, api_key)
+            return True
+
+        launch()
+        try:
+            while in_flight:
+                newest = list(in_flight.values())[-1][0]
+                can_hedge = models and len(in_flight) < MAX_HEDGED_REQUESTS
+                timeout = self.model_stats[newest].hedge_delay() if can_hedge else None
+                done, _ = await asyncio.wait(in_flight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    print(f"⏳ {newest} is slow, hedging with the next model")
+                    launch()
+                    continue
+                failed = False  # A finished request that needs a replacement
+                for task in done:
+                    model, key = in_flight.pop(task)
+                    try:
+                        reply = task.result()
+                    except httpx.TimeoutException as e:
+                        print(f"⏰ {model} timed out")
+                        last_error = e
+                        failed = True
+                        continue
+                    except httpx.HTTPStatusError as e:
+                        if key_pool.report_failure(key, e.response):
+                            # Requests already out on a benched key are left to finish
+                            if key == api_key:
+                                api_key = key_pool.acquire()
+                            if api_key is None:
+                                raise
+                            print(f"🔑 Switching to API key (first 10 chars): {api_key[:10]}...")
+                            launch(model)
+                            continue
+                        if e.response.status_code < 500:
+                            raise
+                        print(f"❌ {model} failed with {e.response.status_code}")
+                        last_error = e
+                        failed = True
+                        continue
+                    if reply:
+                        print(f"🏁 {model} answered first")
+                        return reply
+                    failed = True
+                # One replacement per round of failures; only the hedge timeout
+                # above ever adds a second request alongside it
+                if failed and len(in_flight) < MAX_HEDGED_REQUESTS:
+                    launch()
+        finally:
+            for task in in_flight:
+                task.cancel()
+                # A runner-up that had just started streaming too
+                if task.done() and not task.cancelled() and task.exception() is None and isinstance(task.result(), TextStream):
+                    task.result().cancel()
+        if last_error:
+            raise last_error
+        return None
+
+    async def send_reply(self, channel, reply) -> bool:
+        """Send a reply; a streaming one is followed with live edits. False if it came out empty."""
+        if not isinstance(reply, TextStream):
+            print(f"💬 Liza's reply: {reply}")
+            await channel.send(reply)
+            return True
+        live = LiveMessage(channel)
+        async for text in reply.changes():
+            if text.strip():
+                await live.update([text.strip()])
+        if not reply.task.cancelled() and reply.task.exception():
+            print(f"❌ Stream broke off: {type(reply.task.exception()).__name__}: {reply.task.exception()}")
+        if not reply.text.strip():
+            return False
+        await live.finish([reply.text.strip()])
+        print(f"💬 Liza's reply: {reply.text.strip()}")
+        return True
+
     @commands.Cog.listener()
     async def on_message(self, message):
         if message.author.bot:
@@ -80,78 +317,26 @@ class LizaAI(commands.Cog):
 
     async def generate_liza_response(self, message):
         """Generate Liza's response to a message"""
-        # Select a random API key
-        api_keys = [key for key in OPENROUTER_API_KEYS if key]
-        if not api_keys:
+        if not key_pool:
             print("❌ No API keys found!")
             await message.channel.send("Liza's juice box is empty! No API keys found. 😢")
             return
 
-        api_key = random.choice(api_keys)
-        print(f"🔑 Using API key (first 10 chars): {api_key[:10]}...")
-
         try:
             prompt = self.liza_personality(message.content, message.author.display_name)
             print(f"📝 Prompt length: {len(prompt)} chars")
             
-            headers = {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": "https://discord.com",
-                "X-Title": "Liza Toddler Bot"
-            }
-            
-            # Try the configured model first, then fall back to reliable models
-            models_to_try = [MODEL] + RELIABLE_MODELS
-            
-            for model_to_try in models_to_try:
-                try:
-                    print(f"🤖 Trying model: {model_to_try}")
-                    
-                    payload = {
-                        "model": model_to_try,
-                        "messages": [{"role": "user", "content": prompt}],
-                        "temperature": 1.3,
-                        "top_p": 0.9,
-                        "max_tokens": 140
-                    }
-                    
-                    print(f"🚀 Sending request to OpenRouter with model: {model_to_try}")
-                    
-                    response = requests.post(OPENROUTER_URL, headers=headers, json=payload, timeout=30)
-                    print(f"📡 Response status: {response.status_code}")
-                    
-                    if response.status_code == 404:
-                        print(f"❌ Model {model_to_try} not found, trying next...")
-                        continue
-                    
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    
-                    if "choices" in data and len(data["choices"]) > 0:
-                        liza_reply = data["choices"][0]["message"]["content"].strip()
-                        print(f"💬 Liza's reply: {liza_reply}")
-                        await message.channel.send(liza_reply)
-                        return  # Success, exit the loop
-                    else:
-                        print(f"❌ No choices in response: {data}")
-                        break  # Exit loop if no choices
-                        
-                except requests.exceptions.HTTPError as e:
-                    if e.response.status_code == 404:
-                        print(f"❌ Model {model_to_try} not found (404)")
-                        continue  # Try next model
-                    else:
-                        raise  # Re-raise other HTTP errors
-                        
+            liza_reply = await self.fetch_liza_reply(prompt)
+            if liza_reply and await self.send_reply(message.channel, liza_reply):
+                return
+
             # If we get here, all models failed or no choices
             await message.channel.send("Liza got confused and started babbling nonsense! 🍼")
                 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             print("⏰ Request timed out!")
             await message.channel.send("Liza got distracted by a butterfly and forgot what she was saying! 🦋")
-        except requests.exceptions.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             print(f"❌ HTTP Error: {e}")
             if hasattr(e, 'response') and e.response:
                 error_text = e.response.text[:100] if e.response.text else "No error text"
@@ -169,6 +354,9 @@ class LizaAI(commands.Cog):
                     await message.channel.send(f"Liza spilled her juice! (Error {e.response.status_code}) 😢")
             else:
                 await message.channel.send("Liza spilled her juice and can't talk 😢")
+        except NoKeysAvailable:
+            print("❌ Every API key is disabled or cooling down")
+            await message.channel.send("Liza drank too much juice too fast! (Rate limited) 🚰")
         except Exception as e:
             print(f"❌ Unexpected error: {type(e).__name__}: {e}")
             import traceback
@@ -182,8 +370,7 @@ class LizaAI(commands.Cog):
             return
         
         # Test the API connection
-        api_keys = [key for key in OPENROUTER_API_KEYS if key]
-        if not api_keys:
+        if not key_pool:
             await interaction.response.send_message("❌ Liza's juice boxes are all empty!", ephemeral=True)
             return
             
@@ -192,19 +379,14 @@ class LizaAI(commands.Cog):
     @commands.command(name="testliza")
     async def test_liza(self, ctx):
         """Test Liza's API connection"""
-        api_keys = [key for key in OPENROUTER_API_KEYS if key]
-        await ctx.send(f"🍭 Liza has {len(api_keys)} juice boxes ready!")
+        status = key_pool.status()
+        await ctx.send(f"🍭 Liza has {len(key_pool)} juice boxes ready! ({status['cooling']} cooling down, {status['disabled']} broken)")
         
         # Test the simplest possible request
-        if api_keys:
+        test_key = key_pool.acquire()
+        if test_key:
             try:
-                test_key = api_keys[0]
-                headers = {
-                    "Authorization": f"Bearer {test_key}",
-                    "Content-Type": "application/json",
-                    "HTTP-Referer": "https://discord.com",
-                    "X-Title": "Liza Toddler Bot"
-                }
+                headers = openrouter_headers(test_key)
                 
                 # Test with a reliable model
                 test_payload = {
@@ -213,7 +395,8 @@ class LizaAI(commands.Cog):
                     "max_tokens": 10
                 }
                 
-                test_response = requests.post(OPENROUTER_URL, headers=headers, json=test_payload, timeout=10)
+                test_response = await self.http.post(OPENROUTER_URL, headers=headers, json=test_payload, timeout=10)
+                key_pool.report_failure(test_key, test_response)
                 if test_response.status_code == 200:
                     await ctx.send("✅ Liza's juice boxes are working!")
                 else:
@@ -238,64 +421,24 @@ class LizaAI(commands.Cog):
         
         # Show typing indicator
         async with ctx.channel.typing():
-            # Select a random API key
-            api_keys = [key for key in OPENROUTER_API_KEYS if key]
-            if not api_keys:
+            if not key_pool:
                 await ctx.send("Liza's juice box is empty! No API keys found. 😢")
                 return
-
-            api_key = random.choice(api_keys)
             
             try:
                 # Create a prompt for the command channel
                 prompt = self.liza_personality(message, ctx.author.display_name)
                 
-                headers = {
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                    "HTTP-Referer": "https://discord.com",
-                    "X-Title": "Liza Toddler Bot"
-                }
-                
-                # Try models in order
-                models_to_try = [MODEL] + RELIABLE_MODELS
-                
-                for model_to_try in models_to_try:
-                    try:
-                        payload = {
-                            "model": model_to_try,
-                            "messages": [{"role": "user", "content": prompt}],
-                            "temperature": 1.3,
-                            "top_p": 0.9,
-                            "max_tokens": 140
-                        }
-                        
-                        response = requests.post(OPENROUTER_URL, headers=headers, json=payload, timeout=30)
-                        
-                        if response.status_code == 404:
-                            continue  # Try next model
-                        
-                        response.raise_for_status()
-                        
-                        data = response.json()
-                        
-                        if "choices" in data and len(data["choices"]) > 0:
-                            liza_reply = data["choices"][0]["message"]["content"].strip()
-                            await ctx.send(liza_reply)
-                            return
-                            
-                    except requests.exceptions.HTTPError as e:
-                        if e.response and e.response.status_code == 404:
-                            continue  # Try next model
-                        else:
-                            raise  # Re-raise other errors
+                liza_reply = await self.fetch_liza_reply(prompt)
+                if liza_reply and await self.send_reply(ctx.channel, liza_reply):
+                    return
                 
                 # If we get here, all models failed
                 await ctx.send("Liza got confused and started babbling nonsense! 🍼")
                     
-            except requests.exceptions.Timeout:
+            except httpx.TimeoutException:
                 await ctx.send("Liza got distracted by a butterfly and forgot what she was saying! 🦋")
-            except requests.exceptions.HTTPError as e:
+            except httpx.HTTPStatusError as e:
                 if hasattr(e, 'response') and e.response:
                     if e.response.status_code == 401:
                         await ctx.send("Liza's juice box key doesn't work! (Invalid API key) 🔑")
@@ -307,6 +450,8 @@ class LizaAI(commands.Cog):
                         await ctx.send("Liza spilled her juice! 😢")
                 else:
                     await ctx.send("Liza spilled her juice and can't talk 😢")
+            except NoKeysAvailable:
+                await ctx.send("Liza drank too much juice too fast! (Rate limited) 🚰")
             except Exception as e:
                 print(f"❌ Error in !lizaai command: {e}")
                 await ctx.send("Liza got tangled in her blanket and needs help! 🐻")
@@ -0,0 +1,123 @@
+import re
+from collections import OrderedDict, namedtuple
+
+# Hosts whose links count as media (subdomains included)
+MEDIA_DOMAINS = frozenset({
+    "drive.google.com", "photos.google.com", "imgur.com",
+    "tenor.com", "giphy.com", "media.discordapp.net", "cdn.discordapp.com"
+})
+GIF_DOMAINS = frozenset({"tenor.com", "giphy.com"})
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".bmp")
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".webm", ".mkv")
+GIF_EXTENSIONS = (".gif", ".gifv")
+
+# Whole URL, host and the rest in one match, so each link is parsed once
+URL_PATTERN = re.compile(r"(https?://(?:[^@/\s]*@)?([^/\s?#:]+)(\S*))")
+
+CACHE_SIZE = 4096
+HOST_CACHE_SIZE = 4096  # Distinct hosts remembered; chat links reuse a small set of them
+
+# kind is "image", "video", "gif", "link" or None; url is what an embed should show
+MediaInfo = namedtuple("MediaInfo", ["kind", "url", "has_video", "from_attachment"])
+NO_MEDIA = MediaInfo(None, None, False, False)
+VIDEO_LINK = MediaInfo(None, None, True, False)  # A video URL on a host that isn't a media host
+
+_cache = OrderedDict()
+_host_flags_cache = {}  # host as written -> (media host, gif host)
+
+
+def _host_in(host: str, domains: frozenset) -> bool:
+    """Set lookup of the host and each parent domain (i.imgur.com -> imgur.com)."""
+    while True:
+        if host in domains:
+            return True
+        dot = host.find(".")
+        if dot == -1:
+            return False
+        host = host[dot + 1:]
+
+
+def _host_flags(host: str) -> tuple:
+    """(media host, gif host), looked up once per distinct host."""
+    flags = _host_flags_cache.get(host)
+    if flags is None:
+        lowered = host.lower()
+        flags = (_host_in(lowered, MEDIA_DOMAINS), _host_in(lowered, GIF_DOMAINS))
+        if len(_host_flags_cache) < HOST_CACHE_SIZE:
+            _host_flags_cache[host] = flags
+    return flags
+
+
+def is_media_host(host: str) -> bool:
+    return _host_flags(host)[0]
+
+
+def _link_kind(rest: str, gif_host: bool) -> str:
+    path = rest.partition("?")[0].lower()
+    if path.endswith(VIDEO_EXTENSIONS):
+        return "video"
+    if gif_host or path.endswith(GIF_EXTENSIONS):
+        return "gif"
+    if path.endswith(IMAGE_EXTENSIONS):
+        return "image"
+    return "link"
+
+
+def _attachment_kind(content_type: str) -> str:
+    if "gif" in content_type:
+        return "gif"
+    if "image" in content_type:
+        return "image"
+    if "video" in content_type:
+        return "video"
+    return "link"
+
+
+def _mentions_video(text: str) -> bool:
+    return "video" in text or "mp4" in text or "gifv" in text
+
+
+def classify(content: str, attachments) -> MediaInfo:
+    """Describe the media in a message from its text and attachments.
+
+    Links are checked against the media hosts first; the descriptor is only
+    built for a media link or attachment, so plain links cost a host lookup.
+    """
+    links = URL_PATTERN.findall(content) if content else ()
+    has_video = False
+    if attachments:
+        has_video = any(a.content_type and "video" in a.content_type for a in attachments)
+    # Cheap whole-text check first; only then look at the individual URLs
+    if not has_video and links and _mentions_video(content.lower()):
+        has_video = any(_mentions_video(url.lower()) for url, _, _ in links)
+
+    if attachments:
+        first = attachments[0]
+        return MediaInfo(_attachment_kind(first.content_type or ""), first.url, has_video, True)
+    for url, host, rest in links:
+        media_host, gif_host = _host_flags(host)
+        if media_host:
+            return MediaInfo(_link_kind(rest, gif_host), url, has_video, False)
+    return VIDEO_LINK if has_video else NO_MEDIA
+
+
+def classify_message(msg) -> MediaInfo:
+    """``classify`` with a fast path for plain text and a small per-message cache."""
+    # On its own, one check of a message made only of links costs about twice
+    # the old bare URL scan, because the result also carries the kind and url
+    # the embed needs. Callers ask more than once per message (an index row
+    # wants both "any media" and "video"), and the cache answers the repeat,
+    # so the link-heavy case breaks even and plain chat, which never reaches
+    # classify, is about twice as fast. See bench/bench_media_classifier.py.
+    attachments = msg.attachments
+    content = msg.content
+    if not attachments and (not content or "http" not in content):
+        return NO_MEDIA
+    key = (msg.id, msg.edited_at)
+    info = _cache.get(key)
+    if info is None:
+        info = classify(content, attachments)
+        _cache[key] = info
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return info
@@ -0,0 +1,241 @@
+import random
+import logging
+from typing import Iterable, Optional
+from cogs.sqlite_executor import SQLiteExecutor
+
+logger = logging.getLogger(__name__)
+
+# How many rows to buffer before committing during a backfill
+BACKFILL_BATCH_SIZE = 500
+INDEX_FLUSH_SECONDS = 5  # How often queued gateway updates are written
+SAMPLE_PROBES = 500  # Random positions looked up per sampling round
+SAMPLE_ROUNDS = 4  # Rounds before a sparse filter falls back to listing every match
+
+
+class MessageIndex(SQLiteExecutor):
+    """Local SQLite index of message metadata for message pulls.
+
+    Rows are keyed by message id and hold just enough to answer a pull
+    query (channel, author, creation time and content flags), so a pull is
+    a few indexed lookups followed by a single fetch of the chosen message.
+
+    Every row also gets a position ``seq``, handed out in insertion order
+    and never reused. Sampling looks up random positions and keeps the rows
+    that match the pull, so each matching message is equally likely.
+
+    Gateway updates are queued and written in one transaction per ``flush``.
+    """
+
+    def __init__(self, db_path: str):
+        super().__init__(db_path, "message-index")
+        self.pending = {}  # message id -> row to upsert, or None to delete
+        self.next_seq = 1  # Position for the next new row; read from the table on connect
+
+    def init_db(self):
+        c = self.conn.cursor()
+        c.execute('''CREATE TABLE IF NOT EXISTS messages
+                     (id INTEGER PRIMARY KEY,
+                      guild_id INTEGER NOT NULL,
+                      channel_id INTEGER NOT NULL,
+                      author_id INTEGER NOT NULL,
+                      created_at INTEGER NOT NULL,
+                      has_media BOOLEAN NOT NULL,
+                      has_video BOOLEAN NOT NULL,
+                      has_text BOOLEAN NOT NULL,
+                      seq INTEGER)''')
+        if "seq" not in {column[1] for column in c.execute("PRAGMA table_info(messages)")}:
+            # Indexes from before sampling by position: number the existing rows once
+            c.execute("ALTER TABLE messages ADD COLUMN seq INTEGER")
+            c.execute('''CREATE TEMP TABLE ranked AS
+                         SELECT id, ROW_NUMBER() OVER (ORDER BY id) AS seq FROM messages''')
+            c.execute("CREATE UNIQUE INDEX temp.idx_ranked_id ON ranked (id)")
+            c.execute("UPDATE messages SET seq = (SELECT seq FROM ranked WHERE ranked.id = messages.id)")
+            c.execute("DROP TABLE ranked")
+        c.execute('''CREATE INDEX IF NOT EXISTS idx_messages_guild_seq
+                     ON messages (guild_id, seq)''')
+        c.execute('''CREATE INDEX IF NOT EXISTS idx_messages_guild_created
+                     ON messages (guild_id, created_at)''')
+        c.execute('''CREATE INDEX IF NOT EXISTS idx_messages_guild_author
+                     ON messages (guild_id, author_id, created_at)''')
+        # Per-channel resume point, read forward on every startup; complete marks
+        # that the historical pass through the channel has finished
+        c.execute('''CREATE TABLE IF NOT EXISTS backfill_channels
+                     (channel_id INTEGER PRIMARY KEY,
+                      guild_id INTEGER NOT NULL,
+                      last_message_id INTEGER,
+                      complete BOOLEAN DEFAULT 0)''')
+        # Guilds whose historical pass has finished
+        c.execute('''CREATE TABLE IF NOT EXISTS backfill_guilds
+                     (guild_id INTEGER PRIMARY KEY,
+                      completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+        self.conn.commit()
+        self.next_seq = c.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM messages").fetchone()[0]
+
+    @staticmethod
+    def make_row(msg, has_media: bool, has_video: bool) -> tuple:
+        return (
+            msg.id,
+            msg.guild.id,
+            msg.channel.id,
+            msg.author.id,
+            int(msg.created_at.timestamp()),
+            has_media,
+            has_video,
+            bool(msg.content and msg.content.strip()),
+        )
+
+    # --- Writes ---
+    def _write(self, changes: dict, progress: Optional[tuple] = None):
+        conn = self._connect()
+        rows = [row for row in changes.values() if row is not None]
+        known = set()
+        for start in range(0, len(rows), BACKFILL_BATCH_SIZE):
+            chunk = [row[0] for row in rows[start:start + BACKFILL_BATCH_SIZE]]
+            known.update(message_id for message_id, in conn.execute(
+                f"SELECT id FROM messages WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            ))
+        new_rows = [row for row in rows if row[0] not in known]
+        first_seq = self.next_seq
+        self.next_seq += len(new_rows)
+        with conn:  # One transaction per batch
+            # Edits only change the content flags; a known message keeps its position
+            conn.executemany("UPDATE messages SET has_media = ?, has_video = ?, has_text = ? WHERE id = ?",
+                             [(row[5], row[6], row[7], row[0]) for row in rows if row[0] in known])
+            conn.executemany('''INSERT INTO messages
+                                (id, guild_id, channel_id, author_id, created_at,
+                                 has_media, has_video, has_text, seq)
+                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                             [(*row, seq) for seq, row in enumerate(new_rows, first_seq)])
+            conn.executemany("DELETE FROM messages WHERE id = ?",
+                             [(message_id,) for message_id, row in changes.items() if row is None])
+            if progress is not None:
+                conn.execute('''INSERT OR REPLACE INTO backfill_channels
+                                (channel_id, guild_id, last_message_id, complete)
+                                VALUES (?, ?, ?, ?)''', progress)
+
+    async def queue_rows(self, rows: Iterable[tuple]):
+        for row in rows:
+            self.pending[row[0]] = row
+        if len(self.pending) >= BACKFILL_BATCH_SIZE:
+            await self.flush()
+
+    async def queue_delete(self, message_ids: Iterable[int]):
+        for message_id in message_ids:
+            self.pending[message_id] = None
+        if len(self.pending) >= BACKFILL_BATCH_SIZE:
+            await self.flush()
+
+    async def flush(self):
+        """Write every queued update in one transaction."""
+        if not self.pending:
+            return
+        changes, self.pending = self.pending, {}
+        try:
+            await self._run(self._write, changes)
+        except Exception as e:
+            logger.error(f"Error writing {len(changes)} message index updates: {e}")
+
+    async def save_backfill(self, rows: list, channel_id: int, guild_id: int,
+                            last_message_id: Optional[int], complete: bool = False):
+        """Store a backfill batch together with the channel's resume point."""
+        await self._run(self._write, {row[0]: row for row in rows},
+                        (channel_id, guild_id, last_message_id, complete))
+
+    # --- Backfill bookkeeping ---
+    def _is_guild_ready(self, guild_id: int) -> bool:
+        row = self._connect().execute(
+            "SELECT 1 FROM backfill_guilds WHERE guild_id = ?", (guild_id,)
+        ).fetchone()
+        return row is not None
+
+    async def is_guild_ready(self, guild_id: int) -> bool:
+        return await self._run(self._is_guild_ready, guild_id)
+
+    def _mark_guild_ready(self, guild_id: int):
+        with self._connect() as conn:
+            conn.execute("INSERT OR IGNORE INTO backfill_guilds (guild_id) VALUES (?)", (guild_id,))
+
+    async def mark_guild_ready(self, guild_id: int):
+        await self._run(self._mark_guild_ready, guild_id)
+
+    def _get_channel_progress(self, channel_id: int) -> tuple[Optional[int], bool]:
+        row = self._connect().execute(
+            "SELECT last_message_id, complete FROM backfill_channels WHERE channel_id = ?",
+            (channel_id,)
+        ).fetchone()
+        if row is None:
+            return None, False
+        return row[0], bool(row[1])
+
+    async def get_channel_progress(self, channel_id: int) -> tuple[Optional[int], bool]:
+        return await self._run(self._get_channel_progress, channel_id)
+
+    # --- Queries ---
+    def _sample_messages(self, guild_id: int, channel_ids: list[int], content_flag: str,
+                         before_id: Optional[int], author_id: Optional[int],
+                         limit: int) -> list[tuple[int, int]]:
+        """Return up to ``limit`` (channel_id, message_id) pairs matching the filters.
+
+        Each matching message is equally likely and the pairs come back in
+        random order. Random positions are looked up in batches and the
+        matching rows kept; a filter too sparse to be hit that way lists
+        its matches instead and shuffles them.
+        """
+        if not channel_ids:
+            return []
+        if content_flag not in ("has_media", "has_video", "has_text"):
+            raise ValueError(f"Unknown content flag: {content_flag}")
+        query = f"{content_flag} = 1"
+        params: list = []
+        if before_id is not None:
+            # Snowflakes are time-ordered, so the primary key doubles as the date bound
+            query += " AND id < ?"
+            params.append(before_id)
+        if author_id is not None:
+            query += " AND author_id = ?"
+            params.append(author_id)
+        query += f" AND channel_id IN ({','.join('?' * len(channel_ids))})"
+        params.extend(channel_ids)
+
+        conn = self._connect()
+        lower = conn.execute("SELECT MIN(seq) FROM messages WHERE guild_id = ?", (guild_id,)).fetchone()[0]
+        upper = conn.execute("SELECT MAX(seq) FROM messages WHERE guild_id = ?", (guild_id,)).fetchone()[0]
+        if lower is None:
+            return []
+        positions = range(lower, upper + 1)
+        picked = {}  # message id -> (channel_id, message_id), in draw order
+        for _ in range(SAMPLE_ROUNDS):
+            probes = random.sample(positions, min(SAMPLE_PROBES, len(positions)))
+            hits = {seq: (channel_id, message_id) for seq, channel_id, message_id in conn.execute(
+                f"""SELECT seq, channel_id, id FROM messages
+                    WHERE guild_id = ? AND seq IN ({','.join('?' * len(probes))}) AND {query}""",
+                [guild_id, *probes, *params]
+            )}
+            for seq in probes:
+                if seq in hits:
+                    picked.setdefault(hits[seq][1], hits[seq])
+            if len(picked) >= limit or len(probes) == len(positions):
+                return list(picked.values())[:limit]
+        if picked:
+            return list(picked.values())[:limit]
+        rows = conn.execute(f"SELECT channel_id, id FROM messages WHERE guild_id = ? AND {query}",
+                            [guild_id, *params]).fetchall()
+        random.shuffle(rows)
+        return rows[:limit]
+
+    async def sample_messages(self, guild_id: int, channel_ids: list[int], content_flag: str,
+                              before_id: Optional[int] = None, author_id: Optional[int] = None,
+                              limit: int = 50) -> list[tuple[int, int]]:
+        return await self._run(self._sample_messages, guild_id, channel_ids, content_flag,
+                               before_id, author_id, limit)
+
+    def _count_messages(self, guild_id: int) -> int:
+        row = self._connect().execute("SELECT COUNT(*) FROM messages WHERE guild_id = ?", (guild_id,)).fetchone()
+        return row[0]
+
+    async def count_messages(self, guild_id: int) -> int:
+        return await self._run(self._count_messages, guild_id)
+
+    async def close(self):
+        await self.flush()
+        await super().close()
@@ -1,14 +1,18 @@
 import discord
-from discord.ext import commands
+import asyncio
+from discord.ext import commands, tasks
 from discord import app_commands
 import datetime
-import re
-import json
 import os
 import random
+import heapq
+import itertools
 import aiohttp
 import logging
 from typing import Optional, Tuple
+from cogs.message_index import MessageIndex, BACKFILL_BATCH_SIZE, INDEX_FLUSH_SECONDS
+from cogs.pulled_ids import PulledIdStore
+from cogs.media_classifier import classify_message
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,19 +24,60 @@ MAX_CHANNELS = 25
 MEDIA_LOG_FILE = "messagepull_media_log.json"
 TEXT_LOG_FILE = "messagepull_text_log.json"
 RANDOM_LOG_FILE = "messagepull_random_log.json"
+MESSAGE_INDEX_DB = "messagepull_index.db"
+INDEX_SAMPLE_SIZE = 50  # Candidate rows drawn per index query
+INDEX_SAMPLE_ATTEMPTS = 3  # Index queries per pull before giving up
+SCAN_BUDGET = 20000  # Max messages read per pull when scanning history
+EARLY_EXIT_CANDIDATES = 500  # "Any time" pulls stop once this many candidates were seen
+CHANNEL_SCAN_CONCURRENCY = 4  # Channels scanned at the same time
+POOL_SIZE = 5  # Pre-validated candidates kept per pull type
+POOL_REFILL_SECONDS = 30
+POOL_EMPTY_BACKOFF = datetime.timedelta(minutes=10)  # Wait before rescanning for a pool that came up empty
+# (pull_type, media_type, date_range, months_back) served from pools; defaults of the quick commands
+POOL_SPECS = [
+    ("media", None, "month", 6),
+    ("media", "video", "month", 6),
+    ("text", None, "month", 12),
+    ("random", None, "any", None),
+]
 EXCLUDED_CATEGORY_ID = 1265093508595843193
 EXCLUDED_CHANNEL_IDS = {1398892088984076368}  # starboard
 CONTEXT_TIME_WINDOW = datetime.timedelta(minutes=20)
-MEDIA_DOMAINS = [
-    "drive.google.com", "photos.google.com", "imgur.com",
-    "tenor.com", "giphy.com", "media.discordapp.net", "cdn.discordapp.com"
-]
 
 class JumpToMessageView(discord.ui.View):
     def __init__(self, url: str):
         super().__init__()
         self.add_item(discord.ui.Button(label="Jump to Message", url=url, style=discord.ButtonStyle.link))
 
+class MessageReservoir:
+    """Weighted reservoir sample (Efraimidis-Spirakis A-Res) of at most ``size`` items.
+
+    Memory stays O(size) no matter how many items are offered.
+    """
+    _sequence = itertools.count()  # Tie-breaker so items are never compared
+
+    def __init__(self, size: int = 1):
+        self.size = size
+        self.seen = 0
+        self._heap = []  # (key, sequence, item), smallest key on top
+
+    def offer(self, item, weight: float = 1.0):
+        self.seen += 1
+        if weight <= 0:
+            return
+        self._push(random.random() ** (1.0 / weight), item)
+
+    def _push(self, key: float, item):
+        entry = (key, next(self._sequence), item)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, entry)
+        elif key > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> list:
+        """Kept items, highest key first."""
+        return [item for _, _, item in sorted(self._heap, reverse=True)]
+
 class MessagePullCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
@@ -40,36 +85,142 @@ class MessagePullCog(commands.Cog):
         self.text_pulled_ids = self.load_pulled_ids(TEXT_LOG_FILE)
         self.random_pulled_ids = self.load_pulled_ids(RANDOM_LOG_FILE)
         self.active_sessions = {}  # Store active prefix command sessions
+        self.message_index = MessageIndex(MESSAGE_INDEX_DB)
+        self.indexed_guilds = set()  # Guilds whose index has caught up since startup
+        self.backfill_index.start()
+        self.flush_index.start()
+        self.candidate_pools = {}  # (guild_id, pull_type, media_type) -> [discord.Message]
+        self.pool_retry_at = {}  # Same keys -> earliest time to try refilling again
+        self.refill_pools.start()
         print("[MessagePullCog] Loaded.")
 
-    def load_pulled_ids(self, log_file: str) -> set[str]:
-        """Load previously pulled message IDs from a JSON file."""
-        if not os.path.exists(log_file):
-            return set()
-        with open(log_file, "r") as f:
-            return set(json.load(f))
+    async def cog_unload(self):
+        self.backfill_index.cancel()
+        self.flush_index.cancel()
+        self.refill_pools.cancel()
+        await self.message_index.close()
 
-    def save_pulled_ids(self, pulled_ids: set[str], log_file: str):
-        """Save pulled message IDs to a JSON file."""
-        with open(log_file, "w") as f:
-            json.dump(list(pulled_ids), f, indent=2)
+    def load_pulled_ids(self, log_file: str) -> PulledIdStore:
+        """Load previously pulled message IDs, migrating the old JSON log if needed.
+
+        Additions are persisted by the store itself, one append per pull.
+        """
+        return PulledIdStore(os.path.splitext(log_file)[0], legacy_json=log_file)
 
     def contains_media(self, msg: discord.Message, media_type: Optional[str] = None) -> bool:
         """Check if a message contains media or video."""
+        info = classify_message(msg)
         if media_type == "video":
-            # Check for video attachments
-            for attachment in msg.attachments:
-                if attachment.content_type and "video" in attachment.content_type:
-                    return True
-            # Check for video URLs
-            urls = re.findall(r"https?://\S+", msg.content)
-            return any("video" in url.lower() or "mp4" in url.lower() or "gifv" in url.lower() for url in urls)
-        else:
-            # Check for any media
-            if msg.attachments:
-                return True
-            urls = re.findall(r"https?://\S+", msg.content)
-            return any(domain in url for url in urls for domain in MEDIA_DOMAINS)
+            return info.has_video
+        return info.kind is not None
+
+    def is_eligible(self, msg: discord.Message, pull_type: str, media_type: Optional[str],
+                    target_user: Optional[discord.Member], pulled_ids) -> bool:
+        """Check a scanned message against the pull criteria."""
+        # Skip bots
+        if msg.author.bot:
+            return False
+        
+        # Skip already pulled messages
+        if msg.id in pulled_ids:
+            return False
+        
+        # Check if message is from target user (if specified)
+        if target_user and msg.author.id != target_user.id:
+            return False
+        
+        # Check message content based on pull type
+        if pull_type == "media":
+            return self.contains_media(msg, media_type)
+        # Text and random pulls both need actual text
+        return bool(msg.content and msg.content.strip())
+
+    # --- Message index maintenance ---
+    def is_indexable(self, msg: discord.Message) -> bool:
+        """Only human messages in guild text channels are ever pulled."""
+        return msg.guild is not None and not msg.author.bot and isinstance(msg.channel, discord.TextChannel)
+
+    def index_row(self, msg: discord.Message) -> tuple:
+        return MessageIndex.make_row(msg, self.contains_media(msg), self.contains_media(msg, "video"))
+
+    @tasks.loop(count=1)
+    async def backfill_index(self):
+        """Bring the message index up to date, resumable per channel.
+
+        The first run for a guild is the full historical pass. Every startup
+        after that resumes each channel from its last indexed message, so
+        messages posted while the bot was offline are indexed too. Pulls use
+        the index once the guild has caught up in this session.
+        """
+        for guild in self.bot.guilds:
+            resumed = await self.message_index.is_guild_ready(guild.id)
+            print(f"[MessagePullCog] {'Updating' if resumed else 'Backfilling'} message index for {guild.name}...")
+            for channel in guild.text_channels:
+                await self.backfill_channel(channel)
+            await self.message_index.mark_guild_ready(guild.id)
+            self.indexed_guilds.add(guild.id)
+            print(f"[MessagePullCog] Message index ready for {guild.name} "
+                  f"({await self.message_index.count_messages(guild.id)} messages).")
+
+    @backfill_index.before_loop
+    async def before_backfill_index(self):
+        await self.bot.wait_until_ready()
+
+    async def backfill_channel(self, channel: discord.TextChannel):
+        """Index ``channel`` from its last indexed message up to now.
+
+        ``complete`` only records that the historical pass has finished; a
+        complete channel is still read forward from where it stopped.
+        """
+        last_id, complete = await self.message_index.get_channel_progress(channel.id)
+        after = discord.Object(id=last_id) if last_id else None
+        rows = []
+        try:
+            async for msg in channel.history(limit=None, after=after, oldest_first=True):
+                last_id = msg.id
+                if not msg.author.bot:
+                    rows.append(self.index_row(msg))
+                if len(rows) >= BACKFILL_BATCH_SIZE:
+                    await self.message_index.save_backfill(rows, channel.id, channel.guild.id, last_id, complete)
+                    rows = []
+        except discord.Forbidden:
+            pass
+        except discord.HTTPException as e:
+            # Keep the resume point so the next backfill picks up from here
+            logger.warning(f"Backfill of #{channel.name} stopped early: {e}")
+            await self.message_index.save_backfill(rows, channel.id, channel.guild.id, last_id, complete)
+            return
+        await self.message_index.save_backfill(rows, channel.id, channel.guild.id, last_id, complete=True)
+
+    @tasks.loop(seconds=INDEX_FLUSH_SECONDS)
+    async def flush_index(self):
+        """Write gateway updates to the index in batches, off the event loop."""
+        await self.message_index.flush()
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if self.is_indexable(message):
+            await self.message_index.queue_rows([self.index_row(message)])
+
+    @commands.Cog.listener()
+    async def on_message_edit(self, before: discord.Message, after: discord.Message):
+        if self.is_indexable(after):
+            await self.message_index.queue_rows([self.index_row(after)])
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        # Pooled messages were fetched, not cached, so only the raw event sees their edits
+        self.drop_from_pools({payload.message_id})
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        await self.message_index.queue_delete([payload.message_id])
+        self.drop_from_pools({payload.message_id})
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        await self.message_index.queue_delete(payload.message_ids)
+        self.drop_from_pools(payload.message_ids)
 
     async def get_date_threshold(self, date_range: str, months_back: Optional[int] = None) -> datetime.datetime:
         """Calculate the date threshold based on user selection."""
@@ -93,82 +244,235 @@ class MessagePullCog(commands.Cog):
     async def find_messages(self, source, pull_type: str, date_range: str, 
                            months_back: Optional[int] = None, 
                            media_type: Optional[str] = None,
-                           target_user: Optional[discord.Member] = None) -> Tuple[Optional[discord.Message], Optional[set], Optional[str]]:
-        """Find messages based on criteria."""
+                           target_user: Optional[discord.Member] = None,
+                           scan_budget: Optional[int] = SCAN_BUDGET) -> Tuple[Optional[discord.Message], Optional[PulledIdStore], Optional[str]]:
+        """Find messages based on criteria.
+
+        Pulls that match a ``POOL_SPECS`` entry exactly are answered from the
+        pre-warmed candidate pool; anything else goes through the index or a
+        live scan (see ``sample_candidates``).
+        """
         # Calculate the date threshold
         date_threshold = await self.get_date_threshold(date_range, months_back)
         
         # Determine which log to use
+        log_file, pulled_ids = self.get_pull_log(pull_type)
+
+        # Pools only answer the exact requests they were built for
+        if target_user is None and (pull_type, media_type, date_range, months_back) in POOL_SPECS:
+            pooled = self.take_pooled_candidate(source.guild.id, pull_type, media_type, date_threshold, pulled_ids)
+            if pooled:
+                return pooled, pulled_ids, log_file
+
+        picked = await self.sample_candidates(
+            source.guild, pull_type, date_range, date_threshold, media_type, target_user,
+            pulled_ids, size=1, scan_budget=scan_budget
+        )
+        if not picked:
+            return None, None, None
+        
+        # Return the sampled message with its associated log info
+        return picked[0], pulled_ids, log_file
+
+    def get_pull_log(self, pull_type: str) -> Tuple[str, PulledIdStore]:
         if pull_type == "media":
-            log_file = MEDIA_LOG_FILE
-            pulled_ids = self.media_pulled_ids
+            return MEDIA_LOG_FILE, self.media_pulled_ids
         elif pull_type == "text":
-            log_file = TEXT_LOG_FILE
-            pulled_ids = self.text_pulled_ids
+            return TEXT_LOG_FILE, self.text_pulled_ids
         else:  # random
-            log_file = RANDOM_LOG_FILE
-            pulled_ids = self.random_pulled_ids
-        
-        eligible_messages = []
+            return RANDOM_LOG_FILE, self.random_pulled_ids
+
+    async def sample_candidates(self, guild: discord.Guild, pull_type: str, date_range: str,
+                                date_threshold: datetime.datetime, media_type: Optional[str],
+                                target_user: Optional[discord.Member], pulled_ids,
+                                size: int = 1, scan_budget: Optional[int] = SCAN_BUDGET) -> list:
+        """Pick up to ``size`` random eligible messages.
+
+        Without the index, channels are scanned as a stream and at most
+        ``scan_budget`` messages are read (split evenly across channels).
+        Pass ``scan_budget=None`` to read the full history.
+        """
         channels = []
         
         # Get appropriate channels
         if pull_type == "media":
             channels = [
-                ch for ch in source.guild.text_channels
+                ch for ch in guild.text_channels
                 if ch.category_id != EXCLUDED_CATEGORY_ID and ch.id not in EXCLUDED_CHANNEL_IDS
             ]
         else:
-            channels = list(source.guild.text_channels)
-        
+            channels = list(guild.text_channels)
+
+        # Answer from the local index once the guild has caught up; scan until then
+        if guild.id in self.indexed_guilds:
+            return await self.find_indexed_messages(
+                guild, channels, pull_type, date_threshold, media_type, target_user, pulled_ids, size
+            )
+
         random.shuffle(channels)
-        scanned_channels = 0
+        channels = channels[:MAX_CHANNELS]
+
+        # Stream candidates through a reservoir instead of collecting every match
+        reservoir = MessageReservoir(size)
+        channel_budget = max(1, scan_budget // len(channels)) if scan_budget and channels else None
+        early_exit = date_range == "any"
+
+        # Only page the relevant time window: "older than X" becomes a snowflake upper bound
+        before_id = None if pull_type == "random" else discord.utils.time_snowflake(date_threshold)
+
+        # Scan several channels at once; discord.py paces each channel's history route,
+        # the semaphore keeps the total number of in-flight page requests bounded
+        semaphore = asyncio.Semaphore(CHANNEL_SCAN_CONCURRENCY)
+        decided = asyncio.Event()
+
+        async def scan_channel(channel: discord.TextChannel):
+            async with semaphore:
+                if decided.is_set():
+                    return
+                try:
+                    async for msg in self.history_from_random_offset(channel, before_id, channel_budget):
+                        if not self.is_eligible(msg, pull_type, media_type, target_user, pulled_ids):
+                            continue
+                        # Candidates from every channel go into one shared reservoir as they arrive
+                        reservoir.offer(msg)
+                        if early_exit and reservoir.seen >= EARLY_EXIT_CANDIDATES:
+                            decided.set()
+                            return
+                except discord.Forbidden:
+                    return
+
+        scans = [asyncio.create_task(scan_channel(channel)) for channel in channels]
+        try:
+            for scan in asyncio.as_completed(scans):
+                await scan
+                if decided.is_set():
+                    break
+        finally:
+            # Selection is decided (or failed): stop any scans still paging
+            for scan in scans:
+                scan.cancel()
+            await asyncio.gather(*scans, return_exceptions=True)
         
-        for channel in channels:
-            if scanned_channels >= MAX_CHANNELS:
+        return reservoir.items()
+
+    async def history_from_random_offset(self, channel: discord.TextChannel,
+                                         before_id: Optional[int], limit: Optional[int]):
+        """Yield history older than ``before_id``, starting at a random snowflake.
+
+        Reads forward from a random point between the channel's creation and
+        ``before_id``, then wraps around to the start of the range, so a
+        limited scan lands anywhere in the window rather than at its start.
+        """
+        upper = before_id or discord.utils.time_snowflake(discord.utils.utcnow())
+        lower = channel.id - 1  # Nothing in a channel predates the channel itself
+        if upper <= channel.id:
+            return
+        pivot = random.randint(lower, upper - 1)
+        remaining = limit
+        for after_id, window_end in ((pivot, upper), (lower, pivot + 1)):
+            async for msg in channel.history(limit=remaining, after=discord.Object(id=after_id),
+                                             before=discord.Object(id=window_end), oldest_first=True):
+                yield msg
+                if remaining is not None:
+                    remaining -= 1
+            if remaining is not None and remaining <= 0:
+                return
+
+    async def find_indexed_messages(self, guild: discord.Guild, channels: list, pull_type: str,
+                                    date_threshold: datetime.datetime, media_type: Optional[str],
+                                    target_user: Optional[discord.Member], pulled_ids,
+                                    size: int = 1) -> list:
+        """Pick messages via the local index and fetch only those messages."""
+        if pull_type == "media":
+            content_flag = "has_video" if media_type == "video" else "has_media"
+        else:
+            content_flag = "has_text"
+        before_id = None if pull_type == "random" else discord.utils.time_snowflake(date_threshold)
+
+        found = []
+        tried = set()
+        for _ in range(INDEX_SAMPLE_ATTEMPTS):
+            rows = await self.message_index.sample_messages(
+                guild.id, [ch.id for ch in channels], content_flag,
+                before_id=before_id,
+                author_id=target_user.id if target_user else None,
+                limit=INDEX_SAMPLE_SIZE
+            )
+            if not rows:
                 break
-            scanned_channels += 1
-            
-            try:
-                async for msg in channel.history(oldest_first=True):
-                    # Skip if message is too new (except for random pulls)
-                    if pull_type != "random" and msg.created_at >= date_threshold:
-                        continue
-                    
-                    # Skip bots
-                    if msg.author.bot:
-                        continue
-                    
-                    # Skip already pulled messages
-                    if str(msg.id) in pulled_ids:
-                        continue
-                    
-                    # Check if message is from target user (if specified)
-                    if target_user and msg.author.id != target_user.id:
-                        continue
-                    
-                    # Check message content based on pull type
-                    if pull_type == "text":
-                        if not msg.content or msg.content.strip() == "":
-                            continue
-                    elif pull_type == "media":
-                        if not self.contains_media(msg, media_type):
-                            continue
-                    elif pull_type == "random":
-                        if not msg.content or msg.content.strip() == "":
-                            continue
-                    
-                    eligible_messages.append((msg, pulled_ids, log_file))
-                    
-            except discord.Forbidden:
+            for channel_id, message_id in rows:
+                if message_id in pulled_ids or message_id in tried:
+                    continue
+                tried.add(message_id)
+                channel = guild.get_channel(channel_id)
+                if channel is None:
+                    continue
+                try:
+                    found.append(await channel.fetch_message(message_id))
+                except discord.NotFound:
+                    # Deleted while the bot was offline
+                    await self.message_index.queue_delete([message_id])
+                except discord.Forbidden:
+                    continue
+                if len(found) >= size:
+                    return found
+        return found
+
+    # --- Pre-warmed candidate pools ---
+    def take_pooled_candidate(self, guild_id: int, pull_type: str, media_type: Optional[str],
+                              date_threshold: datetime.datetime, pulled_ids) -> Optional[discord.Message]:
+        """Pop a pooled candidate that still satisfies the request, if any."""
+        pool = self.candidate_pools.get((guild_id, pull_type, media_type))
+        if not pool:
+            return None
+        pool[:] = [msg for msg in pool if msg.id not in pulled_ids]
+        for i, msg in enumerate(pool):
+            if pull_type == "random" or msg.created_at < date_threshold:
+                return pool.pop(i)
+        return None
+
+    def drop_from_pools(self, message_ids: set):
+        for pool in self.candidate_pools.values():
+            pool[:] = [msg for msg in pool if msg.id not in message_ids]
+
+    @tasks.loop(seconds=POOL_REFILL_SECONDS)
+    async def refill_pools(self):
+        """Top up each guild's candidate pools between pulls.
+
+        Pools are only filled from the index. A guild that is still
+        backfilling is skipped, so the refill never adds history scans on
+        top of the backfill.
+        """
+        for guild in self.bot.guilds:
+            if guild.id not in self.indexed_guilds:
                 continue
-        
-        if not eligible_messages:
-            return None, None, None
-        
-        # Select random message and return with its associated log info
-        pulled_message, pulled_ids, log_file = random.choice(eligible_messages)
-        return pulled_message, pulled_ids, log_file
+            for pull_type, media_type, date_range, months_back in POOL_SPECS:
+                key = (guild.id, pull_type, media_type)
+                pool = self.candidate_pools.setdefault(key, [])
+                _, pulled_ids = self.get_pull_log(pull_type)
+                pool[:] = [msg for msg in pool if msg.id not in pulled_ids]
+                now = datetime.datetime.now(datetime.timezone.utc)
+                if len(pool) >= POOL_SIZE or self.pool_retry_at.get(key, now) > now:
+                    continue
+                date_threshold = await self.get_date_threshold(date_range, months_back)
+                pooled_ids = {msg.id for msg in pool}
+                try:
+                    picked = await self.sample_candidates(
+                        guild, pull_type, date_range, date_threshold, media_type, None,
+                        pulled_ids, size=POOL_SIZE
+                    )
+                except Exception as e:
+                    # Any error ends a tasks.loop, so log it and keep the loop alive
+                    logger.warning(f"Refilling {pull_type} pool for {guild.name} failed: {type(e).__name__} - {e}")
+                    continue
+                fresh = [msg for msg in picked if msg.id not in pooled_ids]
+                if not fresh:
+                    self.pool_retry_at[key] = now + POOL_EMPTY_BACKOFF
+                pool.extend(fresh[:POOL_SIZE - len(pool)])
+
+    @refill_pools.before_loop
+    async def before_refill_pools(self):
+        await self.bot.wait_until_ready()
 
     # Dropdown classes for interactive selection
     class PullTypeSelect(discord.ui.Select):
@@ -537,19 +841,8 @@ class MessagePullCog(commands.Cog):
                 await interaction.send(response)
             return
         
-        # Add to pulled IDs
-        pulled_ids.add(str(pulled_message.id))
-        
-        # Save to appropriate log file
-        if pull_type == "media":
-            self.media_pulled_ids = pulled_ids
-            self.save_pulled_ids(pulled_ids, MEDIA_LOG_FILE)
-        elif pull_type == "text":
-            self.text_pulled_ids = pulled_ids
-            self.save_pulled_ids(pulled_ids, TEXT_LOG_FILE)
-        else:
-            self.random_pulled_ids = pulled_ids
-            self.save_pulled_ids(pulled_ids, RANDOM_LOG_FILE)
+        # Add to pulled IDs (persisted by the store)
+        pulled_ids.add(pulled_message.id)
         
         # Create embed
         await self.send_message_embed(interaction, pulled_message, pull_type)
@@ -586,25 +879,20 @@ class MessagePullCog(commands.Cog):
         embed.set_footer(text=footer)
         
         # Add media if present
-        if message.attachments:
-            first_attachment = message.attachments[0]
-            if first_attachment.content_type and "image" in first_attachment.content_type:
-                embed.set_image(url=first_attachment.url)
-            elif first_attachment.content_type and "video" in first_attachment.content_type:
-                video_url = first_attachment.url
+        media = classify_message(message)
+        if media.from_attachment:
+            if media.kind in ("image", "gif"):
+                embed.set_image(url=media.url)
+            elif media.kind == "video":
                 # Send video URL separately
                 if hasattr(interaction_or_ctx, 'followup_send'):
-                    await interaction_or_ctx.followup_send(video_url)
+                    await interaction_or_ctx.followup_send(media.url)
                 else:
-                    await interaction_or_ctx.send(video_url)
+                    await interaction_or_ctx.send(media.url)
         
-        # Check for media URLs in content
-        elif message.content:
-            urls = re.findall(r"https?://\S+", message.content)
-            for url in urls:
-                if any(domain in url for domain in MEDIA_DOMAINS):
-                    embed.set_image(url=url)
-                    break
+        # Media links in content
+        elif media.kind:
+            embed.set_image(url=media.url)
         
         # Add author avatar
         if message.author.avatar:
@@ -646,9 +934,7 @@ class MessagePullCog(commands.Cog):
                 return
             
             # Add to pulled IDs and save
-            pulled_ids.add(str(pulled_message.id))
-            self.media_pulled_ids = pulled_ids
-            self.save_pulled_ids(pulled_ids, MEDIA_LOG_FILE)
+            pulled_ids.add(pulled_message.id)
             
             # Create and send the embed
             await self.send_message_embed(ctx, pulled_message, pull_type)
@@ -674,9 +960,7 @@ class MessagePullCog(commands.Cog):
                 return
             
             # Add to pulled IDs and save
-            pulled_ids.add(str(pulled_message.id))
-            self.text_pulled_ids = pulled_ids
-            self.save_pulled_ids(pulled_ids, TEXT_LOG_FILE)
+            pulled_ids.add(pulled_message.id)
             
             # Create and send the embed
             await self.send_message_embed(ctx, pulled_message, pull_type)
@@ -701,9 +985,7 @@ class MessagePullCog(commands.Cog):
                 return
             
             # Add to pulled IDs and save
-            pulled_ids.add(str(pulled_message.id))
-            self.random_pulled_ids = pulled_ids
-            self.save_pulled_ids(pulled_ids, RANDOM_LOG_FILE)
+            pulled_ids.add(pulled_message.id)
             
             # Create and send the embed
             await self.send_message_embed(ctx, pulled_message, pull_type)
@@ -0,0 +1,118 @@
+import os
+import time
+import asyncio
+import logging
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+KEY_ENV_VARS = [f"OPENROUTER_API_KEY_{i}" for i in range(1, 8)]
+DEFAULT_COOLDOWN = 60  # Seconds a 429 benches a key when the response gives no hint
+MAX_COOLDOWN = 15 * 60  # Cap on any server-provided cooldown
+MAX_KEY_WAIT = 10  # Seconds wait_for_key() will sleep for a key to cool down
+
+
+class NoKeysAvailable(RuntimeError):
+    pass
+
+
+def cooldown_from_response(response) -> float:
+    """Seconds until a rate-limited key may be used again, from the 429 response headers."""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            seconds = float(retry_after)
+        except ValueError:
+            try:
+                seconds = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                seconds = DEFAULT_COOLDOWN
+        return min(max(seconds, 0.0), MAX_COOLDOWN)
+    reset = response.headers.get("X-RateLimit-Reset")  # OpenRouter: epoch milliseconds
+    if reset:
+        try:
+            return min(max(int(reset) / 1000 - time.time(), 0.0), MAX_COOLDOWN)
+        except ValueError:
+            pass
+    return DEFAULT_COOLDOWN
+
+
+class KeyPool:
+    """OpenRouter API keys with health tracking.
+
+    Keys are handed out least-recently-used first. A 429 benches a key until
+    its ``Retry-After`` passes and a 401 disables it for the life of the
+    process, so callers stop retrying keys that cannot work right now.
+    """
+
+    def __init__(self, keys: Iterable[Optional[str]]):
+        self.keys = list(dict.fromkeys(key for key in keys if key))
+        self.last_used = {key: 0.0 for key in self.keys}
+        self.cooldown_until = {key: 0.0 for key in self.keys}
+        self.disabled = set()
+
+    @classmethod
+    def from_env(cls) -> "KeyPool":
+        return cls(os.getenv(name) for name in KEY_ENV_VARS)
+
+    def usable_keys(self) -> list:
+        """Keys that are not disabled, whether or not they are cooling down."""
+        return [key for key in self.keys if key not in self.disabled]
+
+    def __len__(self) -> int:
+        return len(self.usable_keys())
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def acquire(self) -> Optional[str]:
+        """The least recently used ready key, or None if every key is benched."""
+        now = time.monotonic()
+        ready = [key for key in self.usable_keys() if self.cooldown_until[key] <= now]
+        if not ready:
+            return None
+        key = min(ready, key=self.last_used.__getitem__)
+        self.last_used[key] = now
+        return key
+
+    async def wait_for_key(self, max_wait: float = MAX_KEY_WAIT) -> str:
+        """``acquire``, sleeping briefly if a key comes off cooldown within ``max_wait``."""
+        key = self.acquire()
+        if key:
+            return key
+        usable = self.usable_keys()
+        if usable:
+            wait = min(self.cooldown_until[key] for key in usable) - time.monotonic()
+            if wait <= max_wait:
+                logger.info(f"All OpenRouter keys cooling down, waiting {wait:.1f}s")
+                await asyncio.sleep(max(wait, 0.0))
+                key = self.acquire()
+                if key:
+                    return key
+        raise NoKeysAvailable("All OpenRouter keys exhausted or invalid.")
+
+    def report_failure(self, key: str, response) -> bool:
+        """Record a failed response for ``key``; True if it was a key problem (401/429)."""
+        if response.status_code == 401:
+            self.disabled.add(key)
+            logger.warning(f"OpenRouter key {key[:10]}... rejected (401), disabling it")
+            return True
+        if response.status_code == 429:
+            cooldown = cooldown_from_response(response)
+            self.cooldown_until[key] = time.monotonic() + cooldown
+            logger.warning(f"OpenRouter key {key[:10]}... rate limited, cooling down for {cooldown:.0f}s")
+            return True
+        return False
+
+    def status(self) -> dict:
+        now = time.monotonic()
+        cooling = sum(1 for key in self.usable_keys() if self.cooldown_until[key] > now)
+        return {"total": len(self.keys), "disabled": len(self.disabled), "cooling": cooling}
+
+
+# Shared by every cog so a key benched by one is skipped by all
+key_pool = KeyPool.from_env()
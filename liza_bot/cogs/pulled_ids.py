@@ -0,0 +1,96 @@
+import os
+import sys
+import json
+import array
+import bisect
+import logging
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Appended ids are folded into the sorted snapshot once this many pile up
+COMPACT_EVERY = 1024
+
+
+class PulledIdStore:
+    """Set of already-pulled message ids, kept as 64-bit ints.
+
+    Most ids live in a sorted ``array('Q')`` snapshot (8 bytes each, binary
+    searched); new ids go to a small in-memory set and are appended to a
+    log file, so recording a pull is one 8-byte write. The log is merged
+    into the snapshot every ``COMPACT_EVERY`` additions.
+    """
+
+    def __init__(self, path_prefix: str, legacy_json: Optional[str] = None):
+        self.snapshot_file = f"{path_prefix}.bin"
+        self.log_file = f"{path_prefix}.log"
+        self._sorted = array.array("Q")
+        self._recent = set()
+        self.load(legacy_json)
+
+    # Files are little-endian regardless of the host
+    @staticmethod
+    def _to_bytes(ids: array.array) -> bytes:
+        if sys.byteorder == "big":
+            ids = array.array("Q", ids)
+            ids.byteswap()
+        return ids.tobytes()
+
+    @staticmethod
+    def _from_bytes(data: bytes) -> array.array:
+        ids = array.array("Q")
+        ids.frombytes(data[:len(data) - len(data) % ids.itemsize])  # Drop a torn trailing write
+        if sys.byteorder == "big":
+            ids.byteswap()
+        return ids
+
+    def load(self, legacy_json: Optional[str] = None):
+        if os.path.exists(self.snapshot_file):
+            with open(self.snapshot_file, "rb") as f:
+                self._sorted = self._from_bytes(f.read())
+        elif legacy_json and os.path.exists(legacy_json):
+            # One-time migration from the old JSON list of string ids
+            with open(legacy_json, "r") as f:
+                self._sorted = array.array("Q", sorted({int(i) for i in json.load(f)}))
+            self._write_snapshot()
+            logger.info(f"Migrated {len(self._sorted)} pulled ids from {legacy_json}")
+        if os.path.exists(self.log_file):
+            with open(self.log_file, "rb") as f:
+                self._recent = {i for i in self._from_bytes(f.read()) if not self._in_snapshot(i)}
+        if len(self._recent) >= COMPACT_EVERY:
+            self.compact()
+
+    def _in_snapshot(self, msg_id: int) -> bool:
+        i = bisect.bisect_left(self._sorted, msg_id)
+        return i < len(self._sorted) and self._sorted[i] == msg_id
+
+    def __contains__(self, msg_id: Union[int, str]) -> bool:
+        msg_id = int(msg_id)
+        return msg_id in self._recent or self._in_snapshot(msg_id)
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._recent)
+
+    def add(self, msg_id: Union[int, str]):
+        msg_id = int(msg_id)
+        if msg_id in self:
+            return
+        with open(self.log_file, "ab") as f:
+            f.write(self._to_bytes(array.array("Q", [msg_id])))
+        self._recent.add(msg_id)
+        if len(self._recent) >= COMPACT_EVERY:
+            self.compact()
+
+    def compact(self):
+        """Fold the log into the snapshot and truncate the log."""
+        self._sorted = array.array("Q", sorted([*self._sorted, *self._recent]))
+        self._recent = set()
+        self._write_snapshot()
+        # A crash before this truncation only leaves duplicates, which load() skips
+        open(self.log_file, "wb").close()
+
+    def _write_snapshot(self):
+        tmp_file = f"{self.snapshot_file}.tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(self._to_bytes(self._sorted))
+        os.replace(tmp_file, self.snapshot_file)
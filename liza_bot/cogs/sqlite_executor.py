@@ -0,0 +1,43 @@
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SQLiteExecutor:
+    """A SQLite database that is only ever used off the event loop.
+
+    One connection in WAL mode lives on a dedicated single-thread executor,
+    so every query runs in order without touching the event loop and
+    readers never wait on a writer. Subclasses create their schema in
+    ``init_db`` and expose each blocking ``_method`` through ``_run``.
+    """
+
+    def __init__(self, db_path: str, thread_name: str):
+        self.db_path = db_path
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=thread_name)
+        self.conn = None  # Opened on the executor thread, which is the only one that uses it
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.db_path)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")  # Durable enough in WAL mode, far fewer fsyncs
+            self.init_db()
+        return self.conn
+
+    def init_db(self):
+        raise NotImplementedError
+
+    async def open(self):
+        await self._run(self._connect)
+
+    def _close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    async def close(self):
+        await self._run(self._close)
@@ -0,0 +1,190 @@
+import json
+import time
+import asyncio
+import logging
+from collections import defaultdict, deque
+from typing import Callable, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+EDIT_BUDGET = 5  # Discord allows about 5 message edits per 5 seconds in a channel
+EDIT_WINDOW = 5.0
+MESSAGE_LIMIT = 2000  # Characters per Discord message
+LIVE_EDIT_INTERVAL = 1.0  # Minimum seconds between edits of a live message
+
+
+class StreamError(RuntimeError):
+    """An error event in the middle of an OpenRouter stream."""
+
+
+# --- OpenRouter Streams ---
+class TextStream:
+    """Text of a completion that is still arriving.
+
+    Writers ``append`` deltas and ``finish`` once; a single reader follows
+    along with ``changes()``. ``task`` is the reader task feeding it, if any.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.done = False
+        self.started = asyncio.Event()  # Set on the first non-empty delta
+        self.updated = asyncio.Event()
+        self.first_text_at = None
+        self.task = None
+
+    def reset(self):
+        """Start over, for a request retried on another key."""
+        self.text = ""
+        self.updated.set()
+
+    def append(self, delta: str):
+        if not delta:
+            return
+        self.text += delta
+        if not self.started.is_set():
+            self.first_text_at = time.monotonic()
+            self.started.set()
+        self.updated.set()
+
+    def finish(self):
+        self.done = True
+        self.updated.set()
+
+    def cancel(self):
+        if self.task is not None:
+            self.task.cancel()
+
+    async def changes(self):
+        """Yield the text so far whenever more arrives, ending with the final text."""
+        while True:
+            await self.updated.wait()
+            self.updated.clear()
+            yield self.text
+            if self.done:
+                return
+
+
+async def stream_completion(client: httpx.AsyncClient, url: str, payload: dict,
+                            headers: dict, stream: TextStream) -> dict:
+    """POST ``payload`` with ``stream: true`` and feed the SSE deltas into ``stream``.
+
+    Returns the assembled completion in the same shape as a non-streaming
+    response. HTTP errors raise ``httpx.HTTPStatusError`` before any text
+    arrives, so callers keep their status handling.
+    """
+    usage = None
+    async with client.stream("POST", url, json={**payload, "stream": True}, headers=headers) as response:
+        if response.status_code >= 400:
+            await response.aread()
+            response.raise_for_status()
+        async for line in response.aiter_lines():
+            # Blank lines separate events; ":" lines are OpenRouter keep-alive comments
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            chunk = json.loads(data)
+            if "error" in chunk:
+                raise StreamError(chunk["error"].get("message", "stream error"))
+            usage = chunk.get("usage") or usage
+            choices = chunk.get("choices") or [{}]
+            stream.append((choices[0].get("delta") or {}).get("content") or "")
+    return {"choices": [{"message": {"content": stream.text}}], "usage": usage}
+
+
+# --- Discord Edit Pacing ---
+class EditBudget:
+    """Timestamps of recent edits in one channel, to stay under Discord's edit rate limit."""
+
+    def __init__(self):
+        self.times = deque()
+
+    def wait_time(self) -> float:
+        """Seconds until another edit fits in the window."""
+        now = time.monotonic()
+        while self.times and now - self.times[0] >= EDIT_WINDOW:
+            self.times.popleft()
+        if len(self.times) < EDIT_BUDGET:
+            return 0.0
+        return self.times[0] + EDIT_WINDOW - now
+
+    def spend(self):
+        self.times.append(time.monotonic())
+
+
+edit_budgets = defaultdict(EditBudget)  # channel id -> EditBudget
+
+
+def split_message(lines: list, header: Optional[str] = None, separator: str = "\n\n") -> list:
+    """Join ``lines`` under ``header`` into as few messages as fit Discord's limit."""
+    messages = []
+    current = header
+    for line in lines:
+        line = line[:MESSAGE_LIMIT]
+        if current is None:
+            current = line
+        elif len(current) + len(separator) + len(line) > MESSAGE_LIMIT:
+            messages.append(current)
+            current = line
+        else:
+            current += ("\n" if current is header else separator) + line
+    if current is not None:
+        messages.append(current)
+    return messages
+
+
+class LiveMessage:
+    """A Discord message that follows text while it is still being generated.
+
+    ``update`` edits at most every ``LIVE_EDIT_INTERVAL`` and only while the
+    channel's edit budget allows; anything skipped is folded into the next
+    update. ``finish`` always lands, spilling into extra messages if needed.
+    """
+
+    def __init__(self, channel, header: Optional[str] = None, on_call: Optional[Callable] = None):
+        self.channel = channel
+        self.header = header
+        self.on_call = on_call  # Called after each send or edit, for REST call counts
+        self.message = None
+        self.shown = None
+        self.last_edit = 0.0
+        self.budget = edit_budgets[channel.id]
+
+    async def _show(self, content: str):
+        if self.message is None:
+            self.message = await self.channel.send(content)
+        else:
+            await self.message.edit(content=content)
+            self.budget.spend()
+        self.shown = content
+        self.last_edit = time.monotonic()
+        if self.on_call:
+            self.on_call()
+
+    async def update(self, lines: list):
+        if not lines:
+            return
+        content = split_message(lines, self.header)[0]
+        if content == self.shown:
+            return
+        if self.message is not None:
+            if time.monotonic() - self.last_edit < LIVE_EDIT_INTERVAL or self.budget.wait_time() > 0:
+                return
+        await self._show(content)
+
+    async def finish(self, lines: list):
+        if not lines:
+            return
+        messages = split_message(lines, self.header)
+        if messages[0] != self.shown:
+            if self.message is not None:
+                await asyncio.sleep(self.budget.wait_time())
+            await self._show(messages[0])
+        for content in messages[1:]:
+            await self.channel.send(content)
+            if self.on_call:
+                self.on_call()
@@ -6,12 +6,20 @@ import logging
 import discord
 import random
 import json
-import sqlite3
-from datetime import datetime, timedelta
+import copy
+import math
+import time
+import importlib.util
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from discord.ext import commands
 from discord import Interaction, app_commands, ui
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from cogs.openrouter_keys import key_pool
+from cogs.zombie_leaderboard import leaderboard
+from cogs.health_report import HealthReportParser
+from cogs.streaming import TextStream, LiveMessage, MESSAGE_LIMIT, edit_budgets, stream_completion
 
 # --- Constants ---
 VERSION = "2.7.0"
@@ -23,15 +31,28 @@ load_dotenv()
 ZOMBIE_CHANNEL_ID = int(os.getenv("ZOMBIE_CHANNEL_ID", "0"))
 ZOMBIE_LOG_CHANNEL_ID = int(os.getenv("ZOMBIE_LOG_CHANNEL_ID", "0"))
 MODEL = os.getenv("MODEL")
-OPENROUTER_API_KEYS = [key for key in [
-    os.getenv("OPENROUTER_API_KEY_1"),
-    os.getenv("OPENROUTER_API_KEY_2"),
-    os.getenv("OPENROUTER_API_KEY_3"),
-    os.getenv("OPENROUTER_API_KEY_4"),
-    os.getenv("OPENROUTER_API_KEY_5"),
-    os.getenv("OPENROUTER_API_KEY_6"),
-    os.getenv("OPENROUTER_API_KEY_7"),
-] if key]
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+# --- HTTP Client Settings ---
+# Every round makes 8+ sequential OpenRouter calls; keep connections warm between them
+HTTP_LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=120)
+HTTP_TIMEOUT = httpx.Timeout(30, connect=10)
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None  # httpx needs the optional h2 package
+
+# --- Speculative Outcomes ---
+# Opt-in: generate the outcome of both choices while the vote runs, keep the winner
+SPECULATIVE_OUTCOMES = os.getenv("ZOMBIE_SPECULATIVE_OUTCOMES", "0").lower() in ("1", "true", "yes")
+SPECULATIVE_TOKEN_BUDGET = int(os.getenv("ZOMBIE_SPECULATIVE_TOKEN_BUDGET", "20000"))  # Discarded tokens per game
+
+# --- Save Settings ---
+# One writer thread keeps snapshot, journal and delete jobs in submission order
+SAVE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="zombie-save")
+JOURNAL_COMPACT_EVERY = 25  # Journal lines before the next save rewrites the snapshot
+PAIR_STATS = ("bonds", "conflicts")  # Stats keyed by (name1, name2) tuples
+
+# --- Message Streaming ---
+# Stream AI text into the channel when a phase is shown before it has finished generating
+STREAM_AI = os.getenv("ZOMBIE_STREAMING", "1").lower() in ("1", "true", "yes")
 
 # --- Game Speed Settings ---
 SPEED_SETTINGS = {
@@ -141,6 +162,7 @@ CHARACTER_INFO = {
     }
 }
 CHARACTERS = list(CHARACTER_INFO.keys())
+HEALTH_PARSER = HealthReportParser(CHARACTERS)
 
 # --- Death Log Navigation View ---
 class DeathLogView(ui.View):
@@ -175,10 +197,112 @@ class DeathLogView(ui.View):
         else:
             await interaction.response.defer()
 
+# --- Save Files ---
+def new_generation() -> str:
+    """Random tag for a snapshot, so no other snapshot's journal lines can match it."""
+    return os.urandom(8).hex()
+
+def encode_fields(fields: dict, generation: str) -> str:
+    """One JSON object line from already-encoded field values."""
+    body = ",".join(f"{json.dumps(key)}:{value}" for key, value in fields.items())
+    return f'{{"_gen":{json.dumps(generation)},{body}}}\n'
+
+def write_snapshot(save_file: str, journal_file: str, line: str):
+    tmp_file = f"{save_file}.tmp"
+    with open(tmp_file, "w") as f:
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, save_file)
+    # A crash before this truncation leaves lines of an older generation, which load() skips
+    open(journal_file, "w").close()
+
+def append_journal(journal_file: str, line: str):
+    with open(journal_file, "a") as f:
+        f.write(line)
+
+class SaveWriter:
+    """Encodes, diffs and writes one game's save on SAVE_EXECUTOR.
+
+    ``submit`` is the only method called from the event loop. A save that
+    is still waiting for the executor is replaced by a newer one instead of
+    queued behind it, so a slow disk never builds up a backlog of copies.
+    The first write (and every ``JOURNAL_COMPACT_EVERY`` writes after) is a
+    full snapshot via write-then-rename; the rest append the changed fields
+    as one journal line.
+    """
+
+    def __init__(self, save_file: str, journal_file: str):
+        self.save_file = save_file
+        self.journal_file = journal_file
+        self.saved_fields = {}  # Field name -> JSON as last written
+        self.generation = None  # Tag of the current snapshot; journal lines with any other tag are ignored
+        self.journal_entries = 0
+        self.snapshot_written = False
+        self.lock = threading.Lock()
+        self.queued = None  # Latest state not yet picked up by the executor
+
+    def submit(self, data: dict):
+        with self.lock:
+            waiting = self.queued is not None
+            self.queued = data
+        if not waiting:
+            SAVE_EXECUTOR.submit(self.write_queued).add_done_callback(log_save_error)
+
+    def write_queued(self):
+        with self.lock:
+            data, self.queued = self.queued, None
+        self.write(data)
+
+    def resume(self, data: dict, generation, journal_entries: int, snapshot_written: bool):
+        """Continue from a loaded save whose fields are ``data``."""
+        self.saved_fields = {key: json.dumps(value, separators=(",", ":")) for key, value in data.items()}
+        self.generation = generation
+        self.journal_entries = journal_entries
+        self.snapshot_written = snapshot_written
+
+    def write(self, data: dict):
+        fields = {key: json.dumps(value, separators=(",", ":")) for key, value in data.items()}
+        changed = {key: value for key, value in fields.items() if self.saved_fields.get(key) != value}
+        if not changed:
+            return
+        self.saved_fields = fields
+        if not self.snapshot_written or self.journal_entries >= JOURNAL_COMPACT_EVERY:
+            self.generation = new_generation()
+            self.journal_entries = 0
+            self.snapshot_written = True
+            write_snapshot(self.save_file, self.journal_file, encode_fields(fields, self.generation))
+        else:
+            self.journal_entries += 1
+            append_journal(self.journal_file, encode_fields(changed, self.generation))
+
+def remove_save_files(*paths: str):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+def log_save_error(future):
+    if future.exception():
+        logger.error(f"Failed to write zombie game save: {future.exception()}")
+
+def encode_stats(stats: dict) -> dict:
+    return {
+        name: {("|".join(key) if isinstance(key, tuple) else key): value for key, value in counts.items()}
+        for name, counts in stats.items()
+    }
+
+def decode_stats(data: dict) -> dict:
+    return {
+        name: defaultdict(int, {(tuple(key.split("|")) if name in PAIR_STATS else key): value for key, value in counts.items()})
+        for name, counts in data.items()
+    }
+
 # --- Game State ---
 class GameState:
-    def __init__(self, initiator: int, game_mode: str = "player"):
+    def __init__(self, initiator: int, game_mode: str = "player", channel_id: int = None):
         self.initiator = initiator
+        self.channel_id = channel_id  # Channel or thread the game is played in
+        self.game_number = 0
         self.round = 0
         self.alive = CHARACTERS.copy()
         self.dead = []
@@ -201,12 +325,20 @@ class GameState:
         self.game_speed = 1.0
         self.game_mode = game_mode
         self.save_file = f"zombie_game_{initiator}.json"
+        self.journal_file = f"zombie_game_{initiator}.journal"  # Changed fields appended after each save
         self.first_message_id = None
         self.death_log = []
+        self.speculative_tokens = 0  # Tokens spent on discarded outcome branches
+        self.ai_call_timings = []  # Seconds per OpenRouter call in the current round
+        self.rest_calls = 0  # Discord sends and edits in the current round
+        self.round_state = {}  # AI results and shown phases of the round in progress
+        self._writer = SaveWriter(self.save_file, self.journal_file)
 
-    def save(self):
-        data = {
+    def to_dict(self) -> dict:
+        return {
             "initiator": self.initiator,
+            "channel_id": self.channel_id,
+            "game_number": self.game_number,
             "round": self.round,
             "alive": self.alive,
             "dead": self.dead,
@@ -214,26 +346,52 @@ class GameState:
             "last_events": self.last_events,
             "options": self.options,
             "votes": dict(self.votes),
-            "stats": {k: dict(v) for k, v in self.stats.items()},
+            "stats": encode_stats(self.stats),
             "story_seed": self.story_seed,
             "story_context": self.story_context,
             "round_number": self.round_number,
             "game_speed": self.game_speed,
             "game_mode": self.game_mode,
             "first_message_id": self.first_message_id,
-            "death_log": self.death_log
+            "death_log": self.death_log,
+            "round_state": self.round_state
         }
-        with open(self.save_file, 'w') as f:
-            json.dump(data, f, indent=2)
+
+    def save(self):
+        """Checkpoint the fields that changed since the last save.
+
+        Only a copy of the state is taken on the event loop. Encoding,
+        diffing and the file writes all run on ``SAVE_EXECUTOR``. An ended
+        game is never saved again, so its queued delete_save() stays final.
+        """
+        if self.terminated:
+            return
+        self._writer.submit(copy.deepcopy(self.to_dict()))
 
     @classmethod
     def load(cls, initiator: int):
         save_file = f"zombie_game_{initiator}.json"
+        journal_file = f"zombie_game_{initiator}.journal"
         if not os.path.exists(save_file):
             return None
         with open(save_file, 'r') as f:
             data = json.load(f)
-        game = cls(data["initiator"], data.get("game_mode", "player"))
+        generation = data.pop("_gen", 0)  # Saves from before the journal have no generation
+        journal_entries = 0
+        torn_journal = False
+        if generation and os.path.exists(journal_file):
+            with open(journal_file, 'r') as f:
+                for line in f:
+                    try:
+                        delta = json.loads(line)
+                    except json.JSONDecodeError:
+                        torn_journal = True  # Partial last line from a crash mid-append
+                        break
+                    if delta.pop("_gen", None) == generation:
+                        data.update(delta)
+                        journal_entries += 1
+        game = cls(data["initiator"], data.get("game_mode", "player"), data.get("channel_id"))
+        game.game_number = data.get("game_number", 0)
         game.round = data["round"]
         game.alive = data["alive"]
         game.dead = list(dict.fromkeys(data["dead"]))
@@ -241,113 +399,106 @@ class GameState:
         game.last_events = data["last_events"]
         game.options = data["options"]
         game.votes = data["votes"]
-        game.stats = {k: defaultdict(int, v) for k, v in data["stats"].items()}
+        game.stats = decode_stats(data["stats"])
         game.story_seed = data["story_seed"]
         game.story_context = data["story_context"]
         game.round_number = data["round_number"]
         game.game_speed = data.get("game_speed", 1.0)
         game.first_message_id = data.get("first_message_id")
         game.death_log = data.get("death_log", [])
+        game.round_state = data.get("round_state", {})
+        # Legacy saves (no tag, or a counter tag that may repeat) and torn journals
+        # get a fresh snapshot on the next save
+        SAVE_EXECUTOR.submit(
+            game._writer.resume, copy.deepcopy(game.to_dict()), generation, journal_entries,
+            isinstance(generation, str) and not torn_journal
+        ).add_done_callback(log_save_error)
         return game
 
     def delete_save(self):
-        if os.path.exists(self.save_file):
-            os.remove(self.save_file)
-
-    def save_to_leaderboard(self, winner=None):
-        try:
-            conn = sqlite3.connect('zombie_leaderboard.db')
-            c = conn.cursor()
-            c.execute("INSERT INTO games (initiator, winner) VALUES (?, ?)", (self.initiator, winner))
-            game_id = c.lastrowid
-            for char in CHARACTERS:
-                survived = char in self.alive
-                death_round = self.round if not survived else None
-                c.execute('''INSERT INTO character_stats
-                            (character_name, game_id, death_round, survived)
-                            VALUES (?, ?, ?, ?)''',
-                         (char, game_id, death_round, survived))
-            for (char1, char2), bond_strength in self.stats["bonds"].items():
-                if bond_strength > 0:
-                    c.execute('''INSERT INTO relationships
-                                (character1, character2, game_id, bond_strength)
-                                VALUES (?, ?, ?, ?)''',
-                             (char1, char2, game_id, bond_strength))
-            for (char1, char2), conflict_strength in self.stats["conflicts"].items():
-                if conflict_strength > 0:
-                    c.execute('''INSERT INTO relationships
-                                (character1, character2, game_id, conflict_strength)
-                                VALUES (?, ?, ?, ?)''',
-                             (char1, char2, game_id, conflict_strength))
-            conn.commit()
-            conn.close()
-            logger.info("Game results saved to leaderboard")
-        except Exception as e:
-            logger.error(f"Error saving to leaderboard: {e}")
-
-# --- Database Setup ---
-def init_db():
-    conn = sqlite3.connect('zombie_leaderboard.db')
-    c = conn.cursor()
-    c.execute('''CREATE TABLE IF NOT EXISTS games
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  initiator INTEGER,
-                  winner TEXT,
-                  completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
-    c.execute('''CREATE TABLE IF NOT EXISTS character_stats
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  character_name TEXT,
-                  game_id INTEGER,
-                  death_round INTEGER,
-                  survived BOOLEAN,
-                  FOREIGN KEY (game_id) REFERENCES games (id))''')
-    c.execute('''CREATE TABLE IF NOT EXISTS relationships
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  character1 TEXT,
-                  character2 TEXT,
-                  game_id INTEGER,
-                  bond_strength INTEGER DEFAULT 0,
-                  conflict_strength INTEGER DEFAULT 0,
-                  FOREIGN KEY (game_id) REFERENCES games (id))''')
-    conn.commit()
-    conn.close()
-
-init_db()
+        SAVE_EXECUTOR.submit(
+            remove_save_files, self.save_file, self.journal_file, f"{self.save_file}.tmp"
+        ).add_done_callback(log_save_error)
+
+    async def save_to_leaderboard(self, winner=None):
+        character_rows = [
+            (char, None if char in self.alive else self.round, char in self.alive)
+            for char in CHARACTERS
+        ]
+        relationship_rows = [
+            (char1, char2, bond_strength, 0)
+            for (char1, char2), bond_strength in self.stats["bonds"].items() if bond_strength > 0
+        ] + [
+            (char1, char2, 0, conflict_strength)
+            for (char1, char2), conflict_strength in self.stats["conflicts"].items() if conflict_strength > 0
+        ]
+        await leaderboard.save_game(self.initiator, winner, character_rows, relationship_rows)
 
 # --- AI Integration ---
-async def send_openrouter_request(payload):
-    tried_keys = set()
-    for key in OPENROUTER_API_KEYS:
-        if key in tried_keys:
-            continue
+http_client = None  # Shared httpx.AsyncClient, owned by the ZombieGame cog
+
+def get_http_client() -> httpx.AsyncClient:
+    global http_client
+    if http_client is None or http_client.is_closed:
+        http_client = httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT, http2=HTTP2_ENABLED)
+    return http_client
+
+async def close_http_client():
+    global http_client
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
+
+def log_round_stats(g):
+    timings = g.ai_call_timings
+    if timings:
+        total = sum(timings)
+        logger.info(f"Game #{g.game_number} round {g.round_number}: {len(timings)} AI calls, "
+                    f"{total:.2f}s total, {total / len(timings):.2f}s average")
+    logger.info(f"Game #{g.game_number} round {g.round_number}: {g.rest_calls} Discord REST calls")
+    timings.clear()
+    g.rest_calls = 0
+
+async def send_openrouter_request(payload, stream: TextStream = None):
+    # Each failed attempt benches or disables a key, so this is bounded by the pool
+    for _ in range(2 * len(key_pool.keys)):
+        key = await key_pool.wait_for_key()  # Raises once every key is benched or disabled
         headers = {"Authorization": f"Bearer {key}", "Content-Type": "application/json"}
+        start = time.monotonic()
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    json=payload,
-                    headers=headers,
-                    timeout=30
-                )
-                response.raise_for_status()
-                return response.json()
+            if stream is not None:
+                stream.reset()
+                data = await stream_completion(get_http_client(), OPENROUTER_URL, payload, headers, stream)
+                first_token = stream.first_text_at - start if stream.first_text_at else float("nan")
+                logger.info(f"OpenRouter stream: first token in {first_token:.2f}s, done in {time.monotonic() - start:.2f}s")
+                return data
+            response = await get_http_client().post(OPENROUTER_URL, json=payload, headers=headers)
+            elapsed = time.monotonic() - start
+            logger.info(f"OpenRouter call: {response.status_code} in {elapsed:.2f}s ({response.http_version})")
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPStatusError as e:
-            tried_keys.add(key)
-            if e.response.status_code in [401, 429]:
+            if key_pool.report_failure(key, e.response):
                 logger.warning(f"Key failed with status {e.response.status_code}, trying next...")
                 continue
             raise
     raise RuntimeError("All OpenRouter keys exhausted or invalid.")
 
-async def generate_ai_text(messages, temperature=0.8):
-    if not OPENROUTER_API_KEYS:
+async def generate_ai_text(messages, temperature=0.8, usage=None, g=None, stream: TextStream = None):
+    """Completion text, or an "[ERROR: ...]" string; ``stream`` receives the text as it arrives."""
+    if not key_pool:
         return "[ERROR: No AI keys available. Cannot continue the game.]"
-    if active_game and active_game.terminated:
+    if g is not None and g.terminated:
         return None
     payload = {"model": MODEL, "messages": messages, "temperature": temperature}
     try:
-        response = await send_openrouter_request(payload)
+        start = time.monotonic()
+        response = await send_openrouter_request(payload, stream)
+        if g is not None:
+            g.ai_call_timings.append(time.monotonic() - start)
         content = response.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
+        if usage is not None:
+            usage["total_tokens"] += (response.get("usage") or {}).get("total_tokens", 0)
         if content:
             logger.info(f"AI returned:\n{content}")
             return content
@@ -356,41 +507,56 @@ async def generate_ai_text(messages, temperature=0.8):
     except Exception as e:
         logger.error(f"AI request error: {type(e).__name__} - {e}")
         return f"[ERROR: AI request failed: {type(e).__name__}. Cannot continue the game.]"
+    finally:
+        if stream is not None:
+            stream.finish()
 
 # --- Game Logic ---
-active_game = None
-current_speed = 1.0
-game_counter = 0
-
-def is_active():
-    return active_game is not None and not active_game.terminated
-
-def end_game():
-    global active_game
-    if active_game:
-        active_game.terminated = True
-        active_game.delete_save()
-        active_game = None
-
-def get_delay(delay_type):
-    speed_settings = SPEED_SETTINGS.get(current_speed, SPEED_SETTINGS[1.0])
+active_games = {}  # channel or thread id -> GameState
+game_counter = 0  # Game numbers are bot-wide
+
+def get_game(channel_id: int):
+    g = active_games.get(channel_id)
+    return g if g is not None and not g.terminated else None
+
+def is_active(channel_id: int):
+    return get_game(channel_id) is not None
+
+def is_zombie_channel(channel) -> bool:
+    # Threads under the zombie channel each host their own game
+    return channel.id == ZOMBIE_CHANNEL_ID or getattr(channel, "parent_id", None) == ZOMBIE_CHANNEL_ID
+
+def end_game(g):
+    if g:
+        g.terminated = True
+        g.delete_save()
+        if active_games.get(g.channel_id) is g:
+            del active_games[g.channel_id]
+
+def get_delay(delay_type, g=None):
+    speed_settings = SPEED_SETTINGS.get(g.game_speed if g else 1.0, SPEED_SETTINGS[1.0])
     return speed_settings.get(delay_type, 1.0)
 
 # --- Formatting ---
+# Every full and first name in one alternation, longest first so "Shaun Sadsarin"
+# wins over "Shaun"; spans the AI already bolded are matched whole and left alone
+CHARACTER_NAMES = sorted({n for name in CHARACTER_INFO for n in (name, name.split()[0])}, key=len, reverse=True)
+NAME_PATTERN = re.compile(
+    r"\*\*[^*\n]+\*\*|\b(" + "|".join(map(re.escape, CHARACTER_NAMES)) + r")\b(['’]s\b)?"
+)
+FIRST_NAME_PATTERN = re.compile("|".join(re.escape(name.split()[0]) for name in CHARACTER_INFO))
+
 def bold_name(name: str) -> str:
     return f"**{name}**"
 
 def bold_character_names(text: str) -> str:
-    all_names = []
-    for name in CHARACTER_INFO.keys():
-        all_names.append(name)
-        all_names.append(name.split()[0])
-    all_names = sorted(set(all_names), key=len, reverse=True)
-    for name in all_names:
-        text = re.sub(rf'\b({re.escape(name)})[\'’]s\b', rf"**\1**'s", text)
-    for name in all_names:
-        text = re.sub(rf'\b{re.escape(name)}\b', f"**{name}**", text)
-    return text
+    return NAME_PATTERN.sub(_bold_match, text)
+
+def _bold_match(match) -> str:
+    name = match.group(1)
+    if name is None:
+        return match.group(0)  # Already bold
+    return f"**{name}**'s" if match.group(2) else f"**{name}**"
 
 def format_bullet(text: str) -> str:
     text = text.strip().lstrip('•-').strip()
@@ -408,7 +574,7 @@ def enforce_bullets(text: str) -> list:
             continue
         if stripped.startswith(('•', '-', '*')):
             stripped = stripped[1:].strip()
-        contains_name = any(name.split()[0] in stripped for name in CHARACTER_INFO)
+        contains_name = FIRST_NAME_PATTERN.search(stripped) is not None
         if contains_name or (current and len(current) > 100):
             if current:
                 bullets.append(f"• {bold_character_names(current.strip())}")
@@ -423,36 +589,55 @@ def enforce_bullets(text: str) -> list:
         bullets.append(f"• {bold_character_names(current.strip())}")
     return bullets
 
+# --- Emoji Resolution ---
+class EmojiResolver:
+    """Character name -> rendered emoji per guild, rebuilt when the guild's emojis change."""
+
+    def __init__(self):
+        self.cache = {}  # guild id -> {character name: emoji text}
+
+    @staticmethod
+    def build(guild) -> dict:
+        by_name = {}
+        for emoji in guild.emojis:
+            by_name.setdefault(emoji.name, emoji)  # First match, like discord.utils.get
+        rendered = {}
+        for name, info in CHARACTER_INFO.items():
+            emoji = by_name.get(info["emoji"])
+            rendered[name] = str(emoji) if emoji else f":{info['emoji']}:"
+        return rendered
+
+    def render(self, guild, name: str) -> str:
+        emojis = self.cache.get(guild.id)
+        if emojis is None:
+            emojis = self.cache[guild.id] = self.build(guild)
+        return emojis.get(name) or f":{CHARACTER_INFO.get(name, {}).get('emoji', '')}:"
+
+    def invalidate(self, guild_id: int):
+        self.cache.pop(guild_id, None)
+
+emoji_resolver = EmojiResolver()
+
+def character_emoji(channel: discord.TextChannel, name: str) -> str:
+    return emoji_resolver.render(channel.guild, name)
+
 def format_stat_section(title: str, name: str, channel: discord.TextChannel) -> str:
     if name == "None":
         return f"━━━━━━━━━━━━━━\n{title}\n━━━━━━━━━━━━━━\n• None"
     else:
-        emoji_name = CHARACTER_INFO.get(name, {}).get("emoji", "")
-        emoji = discord.utils.get(channel.guild.emojis, name=emoji_name)
-        if emoji:
-            return f"━━━━━━━━━━━━━━\n{title}\n━━━━━━━━━━━━━━\n• {bold_name(name)} {emoji}"
-        else:
-            return f"━━━━━━━━━━━━━━\n{title}\n━━━━━━━━━━━━━━\n• {bold_name(name)} :{emoji_name}:"
+        return f"━━━━━━━━━━━━━━\n{title}\n━━━━━━━━━━━━━━\n• {bold_name(name)} {character_emoji(channel, name)}"
 
 def format_bond_conflict(title: str, pair: tuple, channel: discord.TextChannel) -> str:
     if pair[0] == "None":
         return f"━━━━━━━━━━━━━━\n{title}\n━━━━━━━━━━━━━━\n• None"
     else:
         char1, char2 = pair
-        emoji1 = CHARACTER_INFO.get(char1, {}).get("emoji", "")
-        emoji2 = CHARACTER_INFO.get(char2, {}).get("emoji", "")
-        e1 = discord.utils.get(channel.guild.emojis, name=emoji1)
-        e2 = discord.utils.get(channel.guild.emojis, name=emoji2)
-        if e1 and e2:
-            return f"━━━━━━━━━━━━━━\n{title}\n━━━━━━━━━━━━━━\n• {bold_name(char1)} {e1} & {bold_name(char2)} {e2}"
-        else:
-            return f"━━━━━━━━━━━━━━\n{title}\n━━━━━━━━━━━━━━\n• {bold_name(char1)} :{emoji1}: & {bold_name(char2)} :{emoji2}:"
+        e1 = character_emoji(channel, char1)
+        e2 = character_emoji(channel, char2)
+        return f"━━━━━━━━━━━━━━\n{title}\n━━━━━━━━━━━━━━\n• {bold_name(char1)} {e1} & {bold_name(char2)} {e2}"
 
 # --- AI Prompts ---
-def build_scene_prompt():
-    if not active_game:
-        return ""
-    g = active_game
+def build_scene_prompt(g):
     traits = "\n".join([
         f"{bold_name(n)}: {', '.join(CHARACTER_INFO.get(n.strip(), {}).get('traits', ['Unknown']))}"
         for n in g.alive
@@ -477,10 +662,7 @@ def build_scene_prompt():
         "Do not list multiple options. Do not use numbered choices. Only continue the story."
     )
 
-def build_health_prompt():
-    if not active_game:
-        return ""
-    g = active_game
+def build_health_prompt(g):
     alive_characters = ', '.join([f"{name.split()[0]} ({name})" for name in g.alive])
     return (
         f"{g.story_context}\n"
@@ -493,19 +675,94 @@ def build_health_prompt():
         "Do not use 'Status unknown' or generic descriptions."
     )
 
-def build_scene_summary_prompt(scene_text):
-    if not active_game:
-        return ""
+def build_scene_summary_prompt(scene_text, g):
     return (
-        f"{active_game.story_context}\n"
+        f"{g.story_context}\n"
         f"Scene:\n{scene_text}\n\n"
         "🧠 Summarize the key events in **one direct sentence** without adding a period at the end"
     )
 
+# --- Round Pipeline ---
+# A round is played as these phases in order; each is shown by ZombieGame.show_<phase>
+ROUND_PHASES = ("scene", "health", "dynamics", "dilemma", "choices", "vote", "outcome", "deaths")
+
+def phase_failed(result) -> bool:
+    if isinstance(result, str):
+        return not result or "[ERROR:" in result
+    return result is None
+
+class RoundExecutor:
+    """Runs a round's AI phases as a dependency graph.
+
+    Each phase starts as soon as the phases it needs have finished, so later
+    phases generate while earlier ones are still being streamed to Discord.
+    A failed phase (None or an "[ERROR:" reply) is passed on unchanged to
+    everything downstream instead of running it.
+    """
+
+    def __init__(self, saved: dict = None, on_result=None, game=None):
+        self.tasks = {}
+        self.saved = {} if saved is None else saved  # Phase name -> result, persisted for resumes
+        self.on_result = on_result  # Called after each new result lands in ``saved``
+        self.game = game  # No on_result once this game has been terminated
+        self.outcomes = {}  # Speculative outcome tasks keyed by choice
+        self.streams = {}  # Phase name or choice -> TextStream of its AI text
+
+    def add(self, name: str, func, *deps: str, streamed: bool = False):
+        """Schedule ``func(*results of deps)`` once every phase in ``deps`` is done.
+
+        A ``streamed`` phase also gets ``stream=`` a TextStream (when STREAM_AI
+        is on) that ``ZombieGame.show_live`` can follow.
+        """
+        dep_tasks = [self.tasks[dep] for dep in deps]
+        stream = self.streams[name] = TextStream() if streamed and STREAM_AI else None
+
+        async def run():
+            if name in self.saved:
+                return self.saved[name]
+            results = [await task for task in dep_tasks]
+            for result in results:
+                if phase_failed(result):
+                    return result
+            result = await (func(*results, stream=stream) if stream else func(*results))
+            if not phase_failed(result):
+                self.saved[name] = result
+                if self.on_result and not (self.game is not None and self.game.terminated):
+                    self.on_result()
+            return result
+
+        self.tasks[name] = asyncio.create_task(run())
+
+    async def result(self, name: str):
+        return await self.tasks[name]
+
+    def cancel(self):
+        for task in [*self.tasks.values(), *self.outcomes.values()]:
+            task.cancel()
+
+async def update_scene_context(g, raw_scene: str, raw_summary: str) -> list:
+    """Scene bullets plus summary; also rolls them into the story context the later prompts read."""
+    scene_bullets = enforce_bullets(raw_scene)
+    scene_bullets.append(f"\n━━━━━━━━━━━━━━\n📝 **Scene Summary**\n━━━━━━━━━━━━━━")
+    scene_bullets.append(f"• {bold_character_names(raw_summary)}")
+    g.story_context += "\n".join(scene_bullets) + "\n"
+    g.story_context = "\n".join(g.story_context.strip().splitlines()[-12:])
+    return scene_bullets
+
 # --- Game Commands ---
 class ZombieGame(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.vote_tallies = {}  # choices message id -> VoteTally
+
+    async def cog_load(self):
+        get_http_client()
+        logger.info(f"OpenRouter client ready (HTTP/2: {HTTP2_ENABLED})")
+        await leaderboard.open()
+
+    async def cog_unload(self):
+        await close_http_client()
+        await leaderboard.close()
 
     @app_commands.command(name="version", description="Show the current version of the zombie game.")
     async def version(self, interaction: Interaction):
@@ -513,16 +770,18 @@ class ZombieGame(commands.Cog):
 
     @app_commands.command(name="lizazombie", description="Start a zombie survival game")
     async def lizazombie_slash(self, interaction: Interaction):
-        global game_counter
-        if not OPENROUTER_API_KEYS:
+        if not key_pool:
             await interaction.response.send_message("❌ No AI keys available. Cannot start the game.", ephemeral=True)
             return
         await interaction.response.send_message("✅ Command registered. Preparing zombie survival game...", ephemeral=True)
-        if interaction.channel.id != ZOMBIE_CHANNEL_ID:
+        if not is_zombie_channel(interaction.channel):
             await interaction.followup.send("❌ Run this command in the zombie channel.", ephemeral=True)
             return
-        if is_active():
-            await interaction.followup.send("⚠️ A zombie game is already running.", ephemeral=True)
+        if is_active(interaction.channel.id):
+            await interaction.followup.send("⚠️ A zombie game is already running here.", ephemeral=True)
+            return
+        if any(g.initiator == interaction.user.id for g in active_games.values()):
+            await interaction.followup.send("⚠️ You already have a zombie game running.", ephemeral=True)
             return
         existing_game = GameState.load(interaction.user.id)
         if existing_game:
@@ -530,11 +789,17 @@ class ZombieGame(commands.Cog):
             continue_btn = discord.ui.Button(label="Continue", style=discord.ButtonStyle.green)
             new_btn = discord.ui.Button(label="New Game", style=discord.ButtonStyle.red)
             async def continue_callback(interaction):
-                global active_game, current_speed
-                active_game = existing_game
-                current_speed = active_game.game_speed
+                global game_counter
+                if is_active(interaction.channel.id):
+                    await interaction.response.edit_message(content="⚠️ A zombie game is already running here.", view=None)
+                    return
+                existing_game.channel_id = interaction.channel.id
+                if not existing_game.game_number:  # Saves from before games were numbered
+                    game_counter += 1
+                    existing_game.game_number = game_counter
+                active_games[existing_game.channel_id] = existing_game
                 await interaction.response.edit_message(content="🔄 Continuing previous game...", view=None)
-                await self.run_round(interaction.channel)
+                await self.run_game(interaction.channel, existing_game)
             async def new_callback(interaction):
                 await interaction.response.edit_message(content="🔄 Starting new game...", view=None)
                 await self.ask_game_mode_slash(interaction)
@@ -564,74 +829,36 @@ class ZombieGame(commands.Cog):
 
     async def ask_game_speed(self, interaction: Interaction, game_mode: str):
         view = discord.ui.View()
-        speed_1x = discord.ui.Button(label="1.0x (Normal)", style=discord.ButtonStyle.secondary)
-        speed_15x = discord.ui.Button(label="1.5x (Fast)", style=discord.ButtonStyle.secondary)
-        speed_2x = discord.ui.Button(label="2.0x (Very Fast)", style=discord.ButtonStyle.secondary)
-        speed_3x = discord.ui.Button(label="3.0x (Extreme)", style=discord.ButtonStyle.danger)
-        async def speed_1x_callback(interaction):
-            global current_speed, active_game, game_counter
-            current_speed = 1.0
-            game_counter += 1
-            await interaction.response.edit_message(content="⚡ Game speed set to 1.0x (Normal). Starting game...", view=None)
-            success = await start_game_async(interaction.user.id, game_mode, speed=1.0)
-            if not success:
-                await interaction.followup.send("❌ Failed to start the game. Please try again.", ephemeral=True)
-                return
-            msg = await interaction.channel.send(f"🧟‍♀️ **Game #{game_counter}** starting in...")
-            active_game.first_message_id = msg.id
-            await countdown_message(msg, 3, "🧟‍♀️ Game starting in...")
-            await msg.edit(content="🎮 Game loading...")
-            await self.run_round(interaction.channel)
-        async def speed_15x_callback(interaction):
-            global current_speed, active_game, game_counter
-            current_speed = 1.5
-            game_counter += 1
-            await interaction.response.edit_message(content="⚡ Game speed set to 1.5x (Fast). Starting game...", view=None)
-            success = await start_game_async(interaction.user.id, game_mode, speed=1.5)
-            if not success:
-                await interaction.followup.send("❌ Failed to start the game. Please try again.", ephemeral=True)
-                return
-            msg = await interaction.channel.send(f"🧟‍♀️ **Game #{game_counter}** starting in...")
-            active_game.first_message_id = msg.id
-            await countdown_message(msg, 3, "🧟‍♀️ Game starting in...")
-            await msg.edit(content="🎮 Game loading...")
-            await self.run_round(interaction.channel)
-        async def speed_2x_callback(interaction):
-            global current_speed, active_game, game_counter
-            current_speed = 2.0
-            game_counter += 1
-            await interaction.response.edit_message(content="⚡ Game speed set to 2.0x (Very Fast). Starting game...", view=None)
-            success = await start_game_async(interaction.user.id, game_mode, speed=2.0)
-            if not success:
-                await interaction.followup.send("❌ Failed to start the game. Please try again.", ephemeral=True)
-                return
-            msg = await interaction.channel.send(f"🧟‍♀️ **Game #{game_counter}** starting in...")
-            active_game.first_message_id = msg.id
-            await countdown_message(msg, 3, "🧟‍♀️ Game starting in...")
-            await msg.edit(content="🎮 Game loading...")
-            await self.run_round(interaction.channel)
-        async def speed_3x_callback(interaction):
-            global current_speed, active_game, game_counter
-            current_speed = 3.0
-            game_counter += 1
-            await interaction.response.edit_message(content="⚡ Game speed set to 3.0x (Extreme). Starting game...", view=None)
-            success = await start_game_async(interaction.user.id, game_mode, speed=3.0)
-            if not success:
-                await interaction.followup.send("❌ Failed to start the game. Please try again.", ephemeral=True)
-                return
-            msg = await interaction.channel.send(f"🧟‍♀️ **Game #{game_counter}** starting in...")
-            active_game.first_message_id = msg.id
-            await countdown_message(msg, 3, "🧟‍♀️ Game starting in...")
-            await msg.edit(content="🎮 Game loading...")
-            await self.run_round(interaction.channel)
-        speed_1x.callback = speed_1x_callback
-        speed_15x.callback = speed_15x_callback
-        speed_2x.callback = speed_2x_callback
-        speed_3x.callback = speed_3x_callback
-        view.add_item(speed_1x)
-        view.add_item(speed_15x)
-        view.add_item(speed_2x)
-        view.add_item(speed_3x)
+        speed_options = [
+            (1.0, "1.0x (Normal)", discord.ButtonStyle.secondary),
+            (1.5, "1.5x (Fast)", discord.ButtonStyle.secondary),
+            (2.0, "2.0x (Very Fast)", discord.ButtonStyle.secondary),
+            (3.0, "3.0x (Extreme)", discord.ButtonStyle.danger),
+        ]
+        def make_speed_callback(speed: float, label: str):
+            async def speed_callback(interaction):
+                global game_counter
+                if is_active(interaction.channel.id):
+                    await interaction.response.edit_message(content="⚠️ A zombie game is already running here.", view=None)
+                    return
+                game_counter += 1
+                game_number = game_counter
+                await interaction.response.edit_message(content=f"⚡ Game speed set to {label}. Starting game...", view=None)
+                g = await start_game_async(interaction.user.id, game_mode, speed=speed, channel_id=interaction.channel.id)
+                if not g:
+                    await interaction.followup.send("❌ Failed to start the game. Please try again.", ephemeral=True)
+                    return
+                g.game_number = game_number
+                msg = await interaction.channel.send(f"🧟‍♀️ **Game #{g.game_number}** starting in...")
+                g.first_message_id = msg.id
+                await countdown_message(msg, 3, "🧟‍♀️ Game starting in...", g=g)
+                await msg.edit(content="🎮 Game loading...")
+                await self.run_game(interaction.channel, g)
+            return speed_callback
+        for speed, label, style in speed_options:
+            button = discord.ui.Button(label=label, style=style)
+            button.callback = make_speed_callback(speed, label)
+            view.add_item(button)
         await interaction.followup.send(
             "🏃 **Choose your game speed** (you can change this later with `/speed`):\n"
             "- **1.0x (Normal)**: Balanced pacing, ideal for new players.\n"
@@ -643,34 +870,33 @@ class ZombieGame(commands.Cog):
 
     @app_commands.command(name="endzombie", description="Manually end the zombie game")
     async def end_zombie_slash(self, interaction: Interaction):
-        if not is_active():
+        g = get_game(interaction.channel.id)
+        if not g:
             await interaction.response.send_message("⚠️ No active zombie game to end.", ephemeral=True)
             return
         await interaction.response.send_message("🛑 Manually ending the zombie game...")
-        active_game.terminated = True
-        g = active_game
-        await self.end_summary(interaction.channel)
-        end_game()
+        g.terminated = True
+        await self.end_summary(interaction.channel, g)
+        end_game(g)
 
     @app_commands.command(name="speed", description="Adjust game speed")
     @app_commands.describe(speed="Game speed multiplier (1.0, 1.5, 2.0, or 3.0)")
     async def speed_slash(self, interaction: Interaction, speed: float):
-        global current_speed
-        if not is_active():
+        g = get_game(interaction.channel.id)
+        if not g:
             await interaction.response.send_message("⚠️ No active zombie game to adjust speed.", ephemeral=True)
             return
         if speed not in [1.0, 1.5, 2.0, 3.0]:
             await interaction.response.send_message("⚠️ Invalid speed. Use 1.0, 1.5, 2.0, or 3.0", ephemeral=True)
             return
-        current_speed = speed
-        active_game.game_speed = speed
-        active_game.save()
+        g.game_speed = speed
+        g.save()
         await interaction.response.send_message(f"⚡ Game speed set to {speed}x")
 
     @app_commands.command(name="zombieleaderboard", description="Show zombie game leaderboard statistics")
     async def zombie_leaderboard_slash(self, interaction: Interaction):
         await interaction.response.defer()
-        stats = get_leaderboard_stats()
+        stats = await leaderboard.get_stats()
         if not stats:
             await interaction.followup.send("❌ No leaderboard data available yet.")
             return
@@ -690,213 +916,309 @@ class ZombieGame(commands.Cog):
         embed.set_footer(text="Play more games to see more statistics!")
         await interaction.followup.send(embed=embed)
 
-    async def run_round(self, channel: discord.TextChannel):
-        global active_game
-        if not active_game or active_game.terminated:
-            await channel.send("🛑 Game has been terminated.")
-            return
-        g = active_game
-        g.round += 1
-        if g.terminated:
-            await channel.send("🛑 Game has been terminated.")
-            return
-        g.save()
-        # --- Phase 1: Scene ---
-        raw_scene = await generate_scene(g)
-        if not raw_scene or "[ERROR:" in raw_scene:
-            await channel.send(f"⚠️ {raw_scene or 'AI is not responding. Ending the game.'}")
-            end_game()
+    @app_commands.command(name="zombieleaderboardrebuild", description="Recompute zombie leaderboard totals from every saved game")
+    @app_commands.default_permissions(manage_guild=True)
+    async def zombie_leaderboard_rebuild_slash(self, interaction: Interaction):
+        await interaction.response.defer(ephemeral=True)
+        try:
+            games = await leaderboard.rebuild_totals()
+        except Exception as e:
+            logger.error(f"Error rebuilding leaderboard totals: {e}")
+            await interaction.followup.send("❌ Failed to rebuild the leaderboard.", ephemeral=True)
             return
-        scene_bullets = enforce_bullets(raw_scene)
-        # Generate scene summary
-        raw_summary = await generate_scene_summary("\n".join(scene_bullets), g)
-        if not raw_summary or "[ERROR:" in raw_summary:
-            await channel.send(f"⚠️ {raw_summary or 'AI is not responding. Ending the game.'}")
-            end_game()
+        await interaction.followup.send(f"✅ Leaderboard rebuilt from {games} games.", ephemeral=True)
+
+    @commands.Cog.listener()
+    async def on_guild_emojis_update(self, guild: discord.Guild, before, after):
+        emoji_resolver.invalidate(guild.id)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
+        tally = self.vote_tallies.get(payload.message_id)
+        if tally is None or str(payload.emoji) not in VOTE_EMOJIS:
             return
-        scene_bullets.append(f"\n━━━━━━━━━━━━━━\n📝 **Scene Summary**\n━━━━━━━━━━━━━━")
-        scene_bullets.append(f"• {bold_character_names(raw_summary)}")
-        await channel.send(f"━━━━━━━━━━━━━━\n🎭 **Scene {g.round_number}**\n━━━━━━━━━━━━━━")
-        await stream_bullets_in_message(channel, scene_bullets, "scene")
-        g.story_context += "\n".join(scene_bullets) + "\n"
-        g.story_context = "\n".join(g.story_context.strip().splitlines()[-12:])
-        # --- Phase 2: Health ---
-        raw_health = await generate_health_report(g)
-        if not raw_health or "[ERROR:" in raw_health:
-            await channel.send(f"⚠️ {raw_health or 'AI is not responding. Ending the game.'}")
-            end_game()
+        if payload.user_id == self.bot.user.id or (payload.member and payload.member.bot):
             return
-        health_lines = []
-        processed_characters = set()
-        for line in raw_health.split('\n'):
-            if not line.strip() or not line.strip().startswith('•'):
-                continue
-            line = line.strip().lstrip('•').strip()
-            matched_character = None
-            for name in g.alive:
-                full_name = name
-                first_name = name.split()[0]
-                if (re.search(rf'\b{re.escape(full_name)}\b', line, re.IGNORECASE) or
-                    re.search(rf'\b{re.escape(first_name)}\b', line, re.IGNORECASE)):
-                    matched_character = name
-                    processed_characters.add(name)
-                    break
-            if matched_character:
-                health_status = line
-                for name in g.alive:
-                    full_name = name
-                    first_name = name.split()[0]
-                    health_status = health_status.replace(full_name, '').replace(first_name, '').strip().lstrip(':').strip()
-                if health_status:
-                    words = health_status.split()
-                    if words:
-                        words[0] = words[0].capitalize()
-                        for i in range(1, len(words)):
-                            words[i] = words[i].lower()
-                        health_status = ' '.join(words)
-                else:
-                    health_status = random.choice(["Stable", "Alert", "Tired"])
-                icon = "🟢"
-                if any(word in health_status.lower() for word in ['hurt', 'wounded', 'injured', 'weak', 'tired', 'exhausted', 'panicked']):
-                    icon = "🟡"
-                elif any(word in health_status.lower() for word in ['critical', 'dying', 'bleeding', 'unconscious', 'fever', 'submerged', 'unseen']):
-                    icon = "🔴"
-                emoji_name = CHARACTER_INFO[matched_character]["emoji"]
-                emoji = discord.utils.get(channel.guild.emojis, name=emoji_name)
-                if emoji:
-                    formatted_line = f"{icon} {bold_name(matched_character)} {emoji} : {health_status}"
-                else:
-                    formatted_line = f"{icon} {bold_name(matched_character)} :{emoji_name}: : {health_status}"
-                health_lines.append(formatted_line)
-        # Add missing characters with default statuses
-        for name in g.alive:
-            if name not in processed_characters:
-                emoji_name = CHARACTER_INFO[name]["emoji"]
-                emoji = discord.utils.get(channel.guild.emojis, name=emoji_name)
-                default_status = random.choice(["Stable", "Alert", "Tired"])
-                if emoji:
-                    health_lines.append(f"🟢 {bold_name(name)} {emoji} : {default_status}")
-                else:
-                    health_lines.append(f"🟢 {bold_name(name)} :{emoji_name}: : {default_status}")
-        await channel.send("━━━━━━━━━━━━━━\n🩺 **Health Status**\n━━━━━━━━━━━━━━")
-        await stream_bullets_in_message(channel, health_lines, "health")
-        # --- Phase 2.5: Group Dynamics ---
-        raw_dynamics = await generate_group_dynamics(raw_scene, raw_health, g)
-        if not raw_dynamics or "[ERROR:" in raw_dynamics:
-            await channel.send(f"⚠️ {raw_dynamics or 'AI is not responding. Ending the game.'}")
-            end_game()
+        tally.add(payload.user_id, str(payload.emoji))
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
+        tally = self.vote_tallies.get(payload.message_id)
+        if tally is not None:
+            tally.remove(payload.user_id, str(payload.emoji))
+
+    async def wait_for_votes(self, g, tally, countdown_msg: discord.Message, duration: int):
+        """Run the voting countdown off the live tally.
+
+        Returns True if voting closed early after a quiet period, False when
+        time ran out and None if the game was ended meanwhile.
+        """
+        deadline = time.monotonic() + duration
+        next_edit = time.monotonic() + COUNTDOWN_EDIT_INTERVAL
+        while True:
+            if g.terminated:
+                return None
+            now = time.monotonic()
+            if now >= deadline:
+                return False
+            if tally.total() and now - tally.last_change >= VOTE_QUIET_PERIOD:
+                return True
+            if now >= next_edit:
+                try:
+                    await countdown_msg.edit(content=f"⏳ Voting ends in {math.ceil(deadline - now)} seconds...")
+                    g.rest_calls += 1
+                except Exception as e:
+                    logger.warning(f"Error updating countdown: {e}")
+                next_edit = now + COUNTDOWN_EDIT_INTERVAL
+            # Sleep until a vote arrives or the next deadline; wake at least once a
+            # second to notice /endzombie
+            wake = min(deadline, next_edit, now + 1)
+            if tally.total():
+                wake = min(wake, tally.last_change + VOTE_QUIET_PERIOD)
+            tally.changed.clear()
+            try:
+                await asyncio.wait_for(tally.changed.wait(), timeout=max(wake - time.monotonic(), 0))
+            except asyncio.TimeoutError:
+                pass
+
+    async def await_phase(self, g, rounds, name: str, channel: discord.TextChannel):
+        """Result of a round phase, or None after ending the game if it failed."""
+        result = await rounds.result(name)
+        if phase_failed(result):
+            rounds.cancel()
+            await channel.send(f"⚠️ {result or 'AI is not responding. Ending the game.'}")
+            end_game(g)
+            return None
+        return result
+
+    async def show_live(self, g, rounds, name: str, channel: discord.TextChannel, header: str, format_lines, task=None):
+        """Follow a phase's AI text into a live message while it generates.
+
+        ``format_lines`` turns the complete lines so far into bullets. Returns
+        the LiveMessage for the caller to ``finish`` with the final bullets, or
+        None if the phase was already done (or isn't streamed) and should be
+        shown with the paced renderer instead.
+        """
+        stream = rounds.streams.get(name)
+        task = task or rounds.tasks[name]
+        if stream is None or task.done() or stream.done:
+            return None
+        live = LiveMessage(channel, header, on_call=lambda: count_rest_call(g))
+        while not task.done():
+            update = asyncio.ensure_future(stream.updated.wait())
+            await asyncio.wait({update, task}, return_when=asyncio.FIRST_COMPLETED)
+            update.cancel()
+            stream.updated.clear()
+            text = stream.text if stream.done else stream.text[:stream.text.rfind("\n") + 1]
+            if text.strip() and not phase_failed(text):
+                await live.update(clean_bullets(format_lines(text)))
+            if stream.done:
+                break
+        return live
+
+    async def finish_section(self, g, live, bullets: list, delay_type: str, header: str, channel: discord.TextChannel):
+        """Final bullets of a section: into the live message if it streamed, else paced."""
+        if live is None:
+            await stream_bullets_in_message(channel, bullets, delay_type, g, header=header)
             return
+        await live.finish(clean_bullets(bullets))
+        await asyncio.sleep(get_delay(delay_type, g))
+
+    def start_outcome(self, g, rounds, choice: str):
+        rounds.streams[choice] = stream = TextStream() if STREAM_AI else None
+        rounds.outcomes[choice] = asyncio.create_task(generate_outcome(g, choice, stream))
+
+    async def run_game(self, channel: discord.TextChannel, g):
+        """Play rounds until the game ends. Only the current round's state is kept."""
+        while await self.run_round(channel, g):
+            pass
+
+    async def run_round(self, channel: discord.TextChannel, g) -> bool:
+        """Play one round, or the rest of one after a resume. True if another round follows."""
+        if g.terminated:
+            await channel.send("🛑 Game has been terminated.")
+            return False
+        if not g.round_state:
+            g.round += 1
+            g.round_state = {"results": {}, "shown": []}
+        g.save()
+        rounds = self.schedule_round(g)
+        try:
+            for phase in ROUND_PHASES:
+                if phase in g.round_state["shown"]:
+                    continue
+                if not await getattr(self, f"show_{phase}")(channel, g, rounds):
+                    return False
+                g.round_state["shown"].append(phase)
+                g.save()
+        finally:
+            rounds.cancel()
+        log_round_stats(g)
+        g.round_state = {}
+        # --- Phase 9: Game End Check ---
+        if len(g.alive) <= 1:
+            if len(g.alive) == 1:
+                survivor = g.alive[0]
+                await channel.send(f"🏆 {bold_name(survivor)} {character_emoji(channel, survivor)} is the sole survivor!")
+                await g.save_to_leaderboard(winner=survivor)
+            else:
+                await channel.send("💀 No survivors remain.")
+                await g.save_to_leaderboard()
+            await self.end_summary(channel, g)
+            end_game(g)
+            return False
+        g.round_number += 1
+        g.save()
+        return True
+
+    def schedule_round(self, g):
+        """Start the round's AI phases as a dependency graph; saved results aren't regenerated."""
+        rounds = RoundExecutor(g.round_state["results"], on_result=g.save, game=g)
+        rounds.add("scene", lambda stream=None: generate_scene(g, stream), streamed=True)
+        rounds.add("summary", lambda raw_scene: generate_scene_summary("\n".join(enforce_bullets(raw_scene)), g), "scene")
+        rounds.add("context", lambda raw_scene, raw_summary: update_scene_context(g, raw_scene, raw_summary), "scene", "summary")
+        rounds.add("health", lambda scene_bullets, stream=None: generate_health_report(g, stream), "context", streamed=True)
+        rounds.add("dynamics", lambda raw_scene, raw_health, stream=None: generate_group_dynamics(raw_scene, raw_health, g, stream),
+                   "scene", "health", streamed=True)
+        rounds.add("dilemma", lambda raw_scene, raw_health, stream=None: generate_dilemma(raw_scene, raw_health, g, stream),
+                   "scene", "health", streamed=True)
+        rounds.add("choices", lambda raw_dilemma: generate_choices("\n".join(enforce_bullets(raw_dilemma)), g), "dilemma")
+        return rounds
+
+    # --- Phase 1: Scene ---
+    async def show_scene(self, channel: discord.TextChannel, g, rounds) -> bool:
+        header = f"━━━━━━━━━━━━━━\n🎭 **Scene {g.round_number}**\n━━━━━━━━━━━━━━"
+        live = await self.show_live(g, rounds, "scene", channel, header, enforce_bullets, task=rounds.tasks["context"])
+        scene_bullets = await self.await_phase(g, rounds, "context", channel)
+        if scene_bullets is None:
+            return False
+        await self.finish_section(g, live, scene_bullets, "scene", header, channel)
+        return True
+
+    # --- Phase 2: Health ---
+    async def show_health(self, channel: discord.TextChannel, g, rounds) -> bool:
+        def health_lines(raw_health: str, reported_only: bool = False) -> list:
+            return [
+                f"{record.icon} {bold_name(record.name)} {character_emoji(channel, record.name)} : {record.status}"
+                for record in HEALTH_PARSER.parse(raw_health, g.alive) if record.reported or not reported_only
+            ]
+        header = "━━━━━━━━━━━━━━\n🩺 **Health Status**\n━━━━━━━━━━━━━━"
+        live = await self.show_live(g, rounds, "health", channel, header, lambda text: health_lines(text, reported_only=True))
+        raw_health = await self.await_phase(g, rounds, "health", channel)
+        if raw_health is None:
+            return False
+        await self.finish_section(g, live, health_lines(raw_health), "health", header, channel)
+        return True
+
+    # --- Phase 2.5: Group Dynamics ---
+    async def show_dynamics(self, channel: discord.TextChannel, g, rounds) -> bool:
+        header = "━━━━━━━━━━━━━━\n💬 **Group Dynamics**\n━━━━━━━━━━━━━━"
+        live = await self.show_live(g, rounds, "dynamics", channel, header, lambda text: enforce_bullets(text)[:2])
+        raw_dynamics = await self.await_phase(g, rounds, "dynamics", channel)
+        if raw_dynamics is None:
+            return False
         dynamics_bullets = enforce_bullets(raw_dynamics)
-        await channel.send("━━━━━━━━━━━━━━\n💬 **Group Dynamics**\n━━━━━━━━━━━━━━")
-        await stream_bullets_in_message(channel, dynamics_bullets[:2], "dynamics")
-        # --- Phase 3: Dilemma ---
-        raw_dilemma = await generate_dilemma(raw_scene, raw_health, g)
-        if not raw_dilemma or "[ERROR:" in raw_dilemma:
-            await channel.send(f"⚠️ {raw_dilemma or 'AI is not responding. Ending the game.'}")
-            end_game()
-            return
+        await self.finish_section(g, live, dynamics_bullets[:2], "dynamics", header, channel)
+        return True
+
+    # --- Phase 3: Dilemma ---
+    async def show_dilemma(self, channel: discord.TextChannel, g, rounds) -> bool:
+        header = f"━━━━━━━━━━━━━━\n🧠 **Dilemma – Round {g.round_number}**\n━━━━━━━━━━━━━━"
+        live = await self.show_live(g, rounds, "dilemma", channel, header, enforce_bullets)
+        raw_dilemma = await self.await_phase(g, rounds, "dilemma", channel)
+        if raw_dilemma is None:
+            return False
         dilemma_bullets = enforce_bullets(raw_dilemma)
-        await channel.send(f"━━━━━━━━━━━━━━\n🧠 **Dilemma – Round {g.round_number}**\n━━━━━━━━━━━━━━")
-        await stream_bullets_in_message(channel, dilemma_bullets, "dilemma")
-        # --- Phase 4: Choices ---
-        raw_choices = await generate_choices("\n".join(dilemma_bullets))
-        if not raw_choices or "[ERROR:" in raw_choices:
-            await channel.send(f"⚠️ {raw_choices or 'AI is not responding. Ending the game.'}")
-            end_game()
-            return
+        await self.finish_section(g, live, dilemma_bullets, "dilemma", header, channel)
+        return True
+
+    # --- Phase 4: Choices ---
+    async def show_choices(self, channel: discord.TextChannel, g, rounds) -> bool:
+        raw_choices = await self.await_phase(g, rounds, "choices", channel)
+        if raw_choices is None:
+            return False
         choice_lines = [line.strip() for line in raw_choices.split("\n") if line.strip()]
         numbered = [line for line in choice_lines if line.startswith(("1.", "2."))]
         g.options = numbered if len(numbered) == 2 else choice_lines[:2]
         if len(g.options) != 2 or any(not opt for opt in g.options):
             await channel.send("⚠️ AI did not return two valid choices. Ending game.")
-            end_game()
-            return
-        formatted_options = [bold_character_names(option) for option in g.options]
-        await channel.send("━━━━━━━━━━━━━━\n🔀 **Choices**\n━━━━━━━━━━━━━━")
-        await stream_bullets_in_message(channel, formatted_options, "choices")
-        # --- Phase 5: Voting ---
+            end_game(g)
+            return False
+        # Outcomes only read the story context and alive list, which voting leaves alone,
+        # so they can start before the choice is final
         if g.game_mode == "auto":
-            await asyncio.sleep(get_delay("choices") * 2)
             g.last_choice = random.choice(g.options)
+            self.start_outcome(g, rounds, g.last_choice)
+        elif SPECULATIVE_OUTCOMES and g.speculative_tokens < SPECULATIVE_TOKEN_BUDGET:
+            for option in g.options:
+                self.start_outcome(g, rounds, option)
+        formatted_options = [bold_character_names(option) for option in g.options]
+        await stream_bullets_in_message(channel, formatted_options, "choices", g, header="━━━━━━━━━━━━━━\n🔀 **Choices**\n━━━━━━━━━━━━━━")
+        return True
+
+    # --- Phase 5: Voting ---
+    async def show_vote(self, channel: discord.TextChannel, g, rounds) -> bool:
+        if g.game_mode == "auto":
+            await asyncio.sleep(get_delay("choices", g) * 2)
             await channel.send(f"🤖 **Auto-selected**: {g.last_choice}")
+            g.rest_calls += 1
         else:
             choices_msg = await channel.send("━━━━━━━━━━━━━━\n🗳️ React to vote!")
-            await choices_msg.add_reaction("1️⃣")
-            await choices_msg.add_reaction("2️⃣")
-            countdown_duration = int(20 / current_speed)
-            countdown_msg = await channel.send(f"⏳ Voting ends in {countdown_duration} seconds...")
-            start_time = datetime.utcnow()
-            last_vote_time = start_time
-            votes_cast = set()
-            early_termination = False
-            for i in range(countdown_duration, 0, -1):
-                if active_game and active_game.terminated:
-                    return
-                try:
-                    choices_msg = await channel.fetch_message(choices_msg.id)
-                    votes = await tally_votes(choices_msg, votes_cast)
-                    current_time = datetime.utcnow()
-                    if (votes["1️⃣"] > 0 or votes["2️⃣"] > 0) and (current_time - last_vote_time).total_seconds() >= 5:
-                        early_termination = True
-                        break
-                    if votes["1️⃣"] + votes["2️⃣"] > 0:
-                        last_vote_time = current_time
-                except Exception as e:
-                    logger.warning(f"Error fetching votes: {e}")
-                try:
-                    await countdown_msg.edit(content=f"⏳ Voting ends in {i} seconds...")
-                except Exception as e:
-                    logger.warning(f"Error updating countdown: {e}")
-                await asyncio.sleep(1)
+            # Votes arrive through the raw reaction listeners; no polling
+            tally = VoteTally()
+            self.vote_tallies[choices_msg.id] = tally
+            try:
+                await choices_msg.add_reaction("1️⃣")
+                await choices_msg.add_reaction("2️⃣")
+                countdown_duration = int(20 / g.game_speed)
+                countdown_msg = await channel.send(f"⏳ Voting ends in {countdown_duration} seconds...")
+                g.rest_calls += 4  # Choices message, two reactions and the countdown
+                early_termination = await self.wait_for_votes(g, tally, countdown_msg, countdown_duration)
+            finally:
+                self.vote_tallies.pop(choices_msg.id, None)
+            if early_termination is None:
+                discard_outcomes(g, rounds.outcomes)
+                return False
+            votes = tally.counts()
             try:
-                choices_msg = await channel.fetch_message(choices_msg.id)
-                votes = await tally_votes(choices_msg, votes_cast)
                 if early_termination:
-                    await countdown_msg.edit(content="✅ Voting completed early (5 seconds without new votes)")
+                    await countdown_msg.edit(content=f"✅ Voting completed early ({VOTE_QUIET_PERIOD} seconds without new votes)")
                 else:
                     await countdown_msg.edit(content="✅ Voting period ended")
+                g.rest_calls += 1
             except Exception as e:
-                logger.warning(f"Error fetching final votes: {e}")
-                votes = {"1️⃣": 0, "2️⃣": 0}
+                logger.warning(f"Error updating countdown: {e}")
             if votes["1️⃣"] == 0 and votes["2️⃣"] == 0:
                 await channel.send("No votes cast. Game over.")
-                end_game()
-                return
+                discard_outcomes(g, rounds.outcomes)
+                end_game(g)
+                return False
             g.last_choice = g.options[0] if votes["1️⃣"] >= votes["2️⃣"] else g.options[1]
-        # --- Phase 6: Outcome ---
-        outcome_prompt = (
-            f"{g.story_context}\n"
-            f"The group chose: {g.last_choice}\n"
-            f"Alive characters: {', '.join(g.alive)}\n"
-            "🧠 Describe how this choice affects the situation. "
-            "Be direct and concise. Include who may have died and how."
-        )
-        raw_outcome = await generate_ai_text([
-            {"role": "system", "content": "You are a horror narrator describing consequences of group decisions."},
-            {"role": "user", "content": outcome_prompt}
-        ], temperature=0.85)
+        return True
+
+    # --- Phase 6: Outcome ---
+    async def show_outcome(self, channel: discord.TextChannel, g, rounds) -> bool:
+        if g.last_choice not in rounds.outcomes:
+            self.start_outcome(g, rounds, g.last_choice)
+        outcome_task = rounds.outcomes.pop(g.last_choice)
+        discard_outcomes(g, rounds.outcomes)
+        header = f"━━━━━━━━━━━━━━━━━━━━━━━\n🩸 **End of Round {g.round}**\n━━━━━━━━━━━━━━━━━━━━━━━"
+        live = await self.show_live(g, rounds, g.last_choice, channel, header, enforce_bullets, task=outcome_task)
+        outcome = await outcome_task
+        raw_outcome, death_analysis = outcome.raw_outcome, outcome.death_analysis
         if not raw_outcome or "[ERROR:" in raw_outcome:
             await channel.send(f"⚠️ {raw_outcome or 'AI is not responding. Ending the game.'}")
-            end_game()
-            return
+            end_game(g)
+            return False
+        g.round_state["results"]["outcome"] = [raw_outcome, death_analysis]
+        outcome_bullets = enforce_bullets(raw_outcome)
+        await self.finish_section(g, live, outcome_bullets, "summary", header, channel)
+        return True
+
+    # --- Phase 7: Death Detection ---
+    async def show_deaths(self, channel: discord.TextChannel, g, rounds) -> bool:
+        raw_outcome, death_analysis = g.round_state["results"]["outcome"]
         outcome_bullets = enforce_bullets(raw_outcome)
-        await channel.send(f"━━━━━━━━━━━━━━━━━━━━━━━\n🩸 **End of Round {g.round}**\n━━━━━━━━━━━━━━━━━━━━━━━")
-        await stream_bullets_in_message(channel, outcome_bullets, "summary")
-        # --- Phase 7: Death Detection ---
-        death_detection_prompt = (
-            f"STORY OUTCOME:\n{raw_outcome}\n\n"
-            f"CURRENT ALIVE CHARACTERS: {', '.join(g.alive)}\n\n"
-            "Analyze this story outcome and list ONLY the names of characters who definitely died. "
-            "Return the names in this exact format: \n"
-            "DIED: Name1, Name2, Name3\n\n"
-            "If no characters died, return: \n"
-            "DIED: None\n\n"
-            "Be strict - only include characters who clearly died in the narrative."
-        )
-        death_analysis = await generate_ai_text([
-            {"role": "system", "content": "You are an analyst identifying character deaths from story text."},
-            {"role": "user", "content": death_detection_prompt}
-        ], temperature=0.3)
         new_deaths = []
         if death_analysis and "[ERROR:" not in death_analysis:
             died_match = re.search(r"DIED:\s*(.+?)(?:\n|$)", death_analysis, re.IGNORECASE)
@@ -928,62 +1250,25 @@ class ZombieGame(commands.Cog):
         # --- Phase 8: Survivors ---
         formatted_survivors = []
         for name in g.alive:
-            emoji_name = CHARACTER_INFO.get(name, {}).get("emoji", "")
-            emoji = discord.utils.get(channel.guild.emojis, name=emoji_name)
-            if emoji:
-                formatted_survivors.append(f"• {bold_name(name)} {emoji}")
-            else:
-                formatted_survivors.append(f"• {bold_name(name)} :{emoji_name}:")
+            formatted_survivors.append(f"• {bold_name(name)} {character_emoji(channel, name)}")
         formatted_deaths = []
         for name in new_deaths:
-            emoji_name = CHARACTER_INFO.get(name, {}).get("emoji", "")
-            emoji = discord.utils.get(channel.guild.emojis, name=emoji_name)
-            if emoji:
-                formatted_deaths.append(f"• {bold_name(name)} {emoji}")
-            else:
-                formatted_deaths.append(f"• {bold_name(name)} :{emoji_name}:")
-        await channel.send("━━━━━━━━━━━━━━\n💀 **Deaths This Round**\n━━━━━━━━━━━━━━")
-        await stream_bullets_in_message(channel, formatted_deaths, "stats")
-        await channel.send("━━━━━━━━━━━━━━\n🧍 **Remaining Survivors**\n━━━━━━━━━━━━━━")
-        await stream_bullets_in_message(channel, formatted_survivors, "stats")
-        # --- Phase 9: Game End Check ---
-        if len(g.alive) <= 1:
-            if len(g.alive) == 1:
-                survivor = g.alive[0]
-                emoji_name = CHARACTER_INFO.get(survivor, {}).get("emoji", "")
-                emoji = discord.utils.get(channel.guild.emojis, name=emoji_name)
-                if emoji:
-                    await channel.send(f"🏆 {bold_name(survivor)} {emoji} is the sole survivor!")
-                else:
-                    await channel.send(f"🏆 {bold_name(survivor)} :{emoji_name}: is the sole survivor!")
-                g.save_to_leaderboard(winner=survivor)
-            else:
-                await channel.send("💀 No survivors remain.")
-                g.save_to_leaderboard()
-            await self.end_summary(channel)
-            end_game()
-            return
-        g.round_number += 1
-        await self.run_round(channel)
+            formatted_deaths.append(f"• {bold_name(name)} {character_emoji(channel, name)}")
+        await stream_bullets_in_message(channel, formatted_deaths, "stats", g, header="━━━━━━━━━━━━━━\n💀 **Deaths This Round**\n━━━━━━━━━━━━━━")
+        await stream_bullets_in_message(channel, formatted_survivors, "stats", g, header="━━━━━━━━━━━━━━\n🧍 **Remaining Survivors**\n━━━━━━━━━━━━━━")
+        return True
 
-    async def end_summary(self, channel: discord.TextChannel):
-        g = active_game
+    async def end_summary(self, channel: discord.TextChannel, g):
         if not g or g.terminated:
             return
         await channel.send("━━━━━━━━━━━━━━\n📜 **Game Summary**\n━━━━━━━━━━━━━━")
         valid_deaths = [name for name in g.dead if name and name.lower() != "none"]
         deaths_block = []
         for name in valid_deaths:
-            emoji_name = CHARACTER_INFO.get(name, {}).get("emoji", "")
-            emoji = discord.utils.get(channel.guild.emojis, name=emoji_name)
-            if emoji:
-                deaths_block.append(f"• {bold_name(name)} {emoji}")
-            else:
-                deaths_block.append(f"• {bold_name(name)} :{emoji_name}:")
+            deaths_block.append(f"• {bold_name(name)} {character_emoji(channel, name)}")
         if not deaths_block:
             deaths_block = ["• None"]
-        await channel.send("━━━━━━━━━━━━━━\n🪦 **Deaths (most recent first)**\n━━━━━━━━━━━━━━")
-        await stream_bullets_in_message(channel, deaths_block, "stats")
+        await stream_bullets_in_message(channel, deaths_block, "stats", g, header="━━━━━━━━━━━━━━\n🪦 **Deaths (most recent first)**\n━━━━━━━━━━━━━━")
 
         # --- Final Stats ---
         final_stats = []
@@ -1017,15 +1302,14 @@ class ZombieGame(commands.Cog):
                 await channel.send(f"⚠️ {raw_recap or 'AI is not responding.'}")
             else:
                 recap_bullets = enforce_bullets(raw_recap)
-                await channel.send("━━━━━━━━━━━━━━\n🧠 **Game Recap**\n━━━━━━━━━━━━━━")
-                await stream_bullets_in_message(channel, recap_bullets, "summary")
+                await stream_bullets_in_message(channel, recap_bullets, "summary", g, header="━━━━━━━━━━━━━━\n🧠 **Game Recap**\n━━━━━━━━━━━━━━")
 
         # Log game to log channel
-        await self.log_game_to_channel(channel)
+        await self.log_game_to_channel(channel, g)
 
-        await channel.send(f"━━━━━━━━━━━━━━\n🎬 Thanks for playing **Zombie Survival Game #{game_counter}**!\n━━━━━━━━━━━━━━")
+        await channel.send(f"━━━━━━━━━━━━━━\n🎬 Thanks for playing **Zombie Survival Game #{g.game_number}**!\n━━━━━━━━━━━━━━")
 
-    async def log_game_to_channel(self, channel):
+    async def log_game_to_channel(self, channel, g):
         if not ZOMBIE_LOG_CHANNEL_ID:
             return
 
@@ -1033,13 +1317,12 @@ class ZombieGame(commands.Cog):
         if not log_channel:
             return
 
-        g = active_game
         winner = g.alive[0] if g.alive else "None"
         first_message_url = f"https://discord.com/channels/{channel.guild.id}/{channel.id}/{g.first_message_id}"
 
         # Create main game summary embed
         main_embed = discord.Embed(
-            title=f"🧟 Game #{game_counter} Summary",
+            title=f"🧟 Game #{g.game_number} Summary",
             description=f"**Setting:** {g.story_seed}",
             color=0x00FF00 if g.alive else 0xFF0000
         )
@@ -1062,7 +1345,7 @@ class ZombieGame(commands.Cog):
             main_embed.add_field(name="📊 Top Stats", value=stats_value, inline=False)
 
         main_embed.add_field(name="🔗 Game Start", value=f"[Jump to game]({first_message_url})", inline=False)
-        main_embed.set_footer(text=f"Game ID: {game_counter}")
+        main_embed.set_footer(text=f"Game ID: {g.game_number}")
 
         # Send main embed
         await log_channel.send(embed=main_embed)
@@ -1070,7 +1353,7 @@ class ZombieGame(commands.Cog):
         # Create death log embeds
         death_embeds = []
         current_embed = discord.Embed(
-            title=f"💀 Death Log (Game #{game_counter})",
+            title=f"💀 Death Log (Game #{g.game_number})",
             color=0xFF0000
         )
 
@@ -1083,7 +1366,7 @@ class ZombieGame(commands.Cog):
             if len(current_embed.fields) >= 5:  # Max 5 deaths per embed
                 death_embeds.append(current_embed)
                 current_embed = discord.Embed(
-                    title=f"💀 Death Log (Game #{game_counter}) - Continued",
+                    title=f"💀 Death Log (Game #{g.game_number}) - Continued",
                     color=0xFF0000
                 )
 
@@ -1099,13 +1382,13 @@ class ZombieGame(commands.Cog):
                 await log_channel.send(embed=death_embeds[0], view=view)
 
 # --- Utilities ---
-async def generate_scene(g):
-    if not active_game:
+async def generate_scene(g, stream=None):
+    if g.terminated:
         return "[ERROR: No active game.]"
     raw_scene = await generate_ai_text([
         {"role": "system", "content": "You are a horror narrator generating cinematic zombie survival scenes."},
-        {"role": "user", "content": build_scene_prompt()}
-    ])
+        {"role": "user", "content": build_scene_prompt(g)}
+    ], g=g, stream=stream)
     if not raw_scene or "[ERROR:" in raw_scene:
         return raw_scene
     auto_track_deaths(raw_scene, g)
@@ -1113,30 +1396,30 @@ async def generate_scene(g):
     return raw_scene
 
 async def generate_scene_summary(scene_text, g):
-    if not active_game:
+    if g.terminated:
         return "[ERROR: No active game.]"
     raw_summary = await generate_ai_text([
         {"role": "system", "content": "You are a horror narrator summarizing a zombie survival scene."},
-        {"role": "user", "content": build_scene_summary_prompt(scene_text)}
-    ], temperature=0.7)
+        {"role": "user", "content": build_scene_summary_prompt(scene_text, g)}
+    ], temperature=0.7, g=g)
     if not raw_summary or "[ERROR:" in raw_summary:
         return raw_summary
     return raw_summary
 
-async def generate_health_report(g):
-    if not active_game:
+async def generate_health_report(g, stream=None):
+    if g.terminated:
         return "[ERROR: No active game.]"
     raw_health = await generate_ai_text([
         {"role": "system", "content": "You are a horror narrator generating a health report."},
-        {"role": "user", "content": build_health_prompt()}
-    ])
+        {"role": "user", "content": build_health_prompt(g)}
+    ], g=g, stream=stream)
     if not raw_health or "[ERROR:" in raw_health:
         return raw_health
     auto_track_stats(raw_health, g)
     return raw_health
 
-async def generate_group_dynamics(scene_text, health_text, g):
-    if not active_game:
+async def generate_group_dynamics(scene_text, health_text, g, stream=None):
+    if g.terminated:
         return "[ERROR: No active game.]"
     raw_dynamics = await generate_ai_text([
         {"role": "system", "content": "You are a horror narrator generating group dynamics for a survival game."},
@@ -1149,13 +1432,13 @@ async def generate_group_dynamics(scene_text, health_text, g):
             "Format as bullet points using •. "
             "Do not include choices or options. Only describe the group dynamics."
         )}
-    ], temperature=0.9)
+    ], temperature=0.9, g=g, stream=stream)
     if not raw_dynamics or "[ERROR:" in raw_dynamics:
         return raw_dynamics
     return raw_dynamics
 
-async def generate_dilemma(scene_text, health_text, g):
-    if not active_game:
+async def generate_dilemma(scene_text, health_text, g, stream=None):
+    if g.terminated:
         return "[ERROR: No active game.]"
     raw_dilemma = await generate_ai_text([
         {"role": "system", "content": "You are a horror narrator generating dilemmas for a survival game."},
@@ -1168,30 +1451,122 @@ async def generate_dilemma(scene_text, health_text, g):
             "Do not include any choices or options. Only describe the situation. "
             "Format as exactly two bullet points using • without dashes."
         )}
-    ], temperature=0.9)
+    ], temperature=0.9, g=g, stream=stream)
     if not raw_dilemma or "[ERROR:" in raw_dilemma:
         return raw_dilemma
     auto_track_stats(raw_dilemma, g)
     return raw_dilemma
 
-async def generate_choices(dilemma_text):
-    if not active_game:
+async def generate_choices(dilemma_text, g):
+    if g.terminated:
         return "[ERROR: No active game.]"
     raw_choices = await generate_ai_text([
         {"role": "system", "content": "You are a horror narrator generating voting choices."},
         {"role": "user", "content": (
-            f"{active_game.story_context}\n"
+            f"{g.story_context}\n"
             f"Dilemma:\n{dilemma_text}\n\n"
             "Based on the current scene, list exactly 2 distinct choices the survivors could make next. "
             "Format each as a numbered bullet starting with '1.' and '2.'"
         )}
-    ], temperature=0.8)
+    ], temperature=0.8, g=g)
     if not raw_choices or "[ERROR:" in raw_choices:
         return raw_choices
     return raw_choices
 
+# --- Voting ---
+VOTE_EMOJIS = ("1️⃣", "2️⃣")
+VOTE_QUIET_PERIOD = 5  # Seconds without a vote change that close voting early
+COUNTDOWN_EDIT_INTERVAL = 5  # Seconds between countdown message edits
+
+class VoteTally:
+    """Reaction votes on one choices message, fed by raw reaction events.
+
+    Each user counts once, for the option they reacted with most recently
+    and haven't taken back.
+    """
+
+    def __init__(self):
+        self.picks = {}  # user_id -> vote emojis in the order they were added
+        self.last_change = time.monotonic()
+        self.changed = asyncio.Event()
+
+    def add(self, user_id: int, emoji: str):
+        picks = self.picks.setdefault(user_id, [])
+        if emoji in picks:
+            picks.remove(emoji)
+        picks.append(emoji)
+        self._touch()
+
+    def remove(self, user_id: int, emoji: str):
+        picks = self.picks.get(user_id)
+        if not picks or emoji not in picks:
+            return
+        picks.remove(emoji)
+        if not picks:
+            del self.picks[user_id]
+        self._touch()
+
+    def _touch(self):
+        self.last_change = time.monotonic()
+        self.changed.set()
+
+    def total(self) -> int:
+        return len(self.picks)
+
+    def counts(self) -> dict:
+        votes = {emoji: 0 for emoji in VOTE_EMOJIS}
+        for picks in self.picks.values():
+            votes[picks[-1]] += 1
+        return votes
+
+Outcome = namedtuple("Outcome", ["raw_outcome", "death_analysis", "tokens"])
+
+async def generate_outcome(g, choice: str, stream: TextStream = None) -> Outcome:
+    """Outcome narrative for ``choice`` (streamed into ``stream``) and the death analysis of it."""
+    usage = {"total_tokens": 0}
+    outcome_prompt = (
+        f"{g.story_context}\n"
+        f"The group chose: {choice}\n"
+        f"Alive characters: {', '.join(g.alive)}\n"
+        "🧠 Describe how this choice affects the situation. "
+        "Be direct and concise. Include who may have died and how."
+    )
+    raw_outcome = await generate_ai_text([
+        {"role": "system", "content": "You are a horror narrator describing consequences of group decisions."},
+        {"role": "user", "content": outcome_prompt}
+    ], temperature=0.85, usage=usage, g=g, stream=stream)
+    if not raw_outcome or "[ERROR:" in raw_outcome:
+        return Outcome(raw_outcome, None, usage["total_tokens"])
+    death_detection_prompt = (
+        f"STORY OUTCOME:\n{raw_outcome}\n\n"
+        f"CURRENT ALIVE CHARACTERS: {', '.join(g.alive)}\n\n"
+        "Analyze this story outcome and list ONLY the names of characters who definitely died. "
+        "Return the names in this exact format: \n"
+        "DIED: Name1, Name2, Name3\n\n"
+        "If no characters died, return: \n"
+        "DIED: None\n\n"
+        "Be strict - only include characters who clearly died in the narrative."
+    )
+    death_analysis = await generate_ai_text([
+        {"role": "system", "content": "You are an analyst identifying character deaths from story text."},
+        {"role": "user", "content": death_detection_prompt}
+    ], temperature=0.3, usage=usage, g=g)
+    return Outcome(raw_outcome, death_analysis, usage["total_tokens"])
+
+def discard_outcomes(g, outcomes: dict):
+    """Cancel speculative outcomes that lost the vote and charge their tokens to the game."""
+    for task in outcomes.values():
+        if task.done() and not task.cancelled() and task.exception() is None:
+            g.speculative_tokens += task.result().tokens
+        else:
+            task.cancel()
+    if outcomes:
+        logger.info(f"Discarded {len(outcomes)} speculative outcome(s); "
+                    f"{g.speculative_tokens}/{SPECULATIVE_TOKEN_BUDGET} speculative tokens used")
+    outcomes.clear()
+
 async def generate_full_recap(g):
-    if not active_game:
+    if g.terminated:
         return "[ERROR: No active game.]"
     raw_recap = await generate_ai_text([
         {"role": "system", "content": "You are a horror narrator creating a cinematic recap of an entire zombie survival story."},
@@ -1202,13 +1577,13 @@ async def generate_full_recap(g):
             "🎬 Write a brief cinematic recap of the ENTIRE game story in 3 direct bullet points. "
             "Include how it began, key turning points, and how it concluded. Focus on the overall narrative arc."
         )}
-    ], temperature=0.7)
+    ], temperature=0.7, g=g)
     if not raw_recap or "[ERROR:" in raw_recap:
         return raw_recap
     return raw_recap
 
 def auto_track_deaths(raw_scene: str, g):
-    if not raw_scene or "[ERROR:" in raw_scene or not active_game:
+    if not raw_scene or "[ERROR:" in raw_scene or g.terminated:
         return
     bullets = raw_scene.split("•")[1:]
     for bullet in bullets:
@@ -1225,90 +1600,94 @@ def auto_track_deaths(raw_scene: str, g):
                         g.alive.remove(name)
                         print(f"☠️ {name} marked dead based on bullet: {bullet.strip()}")
 
+# --- Stat Tracking ---
+STAT_KEYWORDS = {
+    "helped": ("help", "assist", "protect", "save", "heal", "aid", "support"),
+    "resourceful": ("improvise", "solve", "navigate", "strategize", "craft", "build", "repair", "scavenge", "plan"),
+    "sinister": ("betray", "attack", "abandon", "sabotage", "threaten", "steal", "harm", "endanger"),
+    "dignified": ("grace", "sacrifice", "honor", "calm", "composure", "dignity", "bravery", "courage"),
+}
+RELATIONSHIP_KEYWORDS = {
+    "bonds": ("share", "nod", "exchange", "trust", "help", "protect", "comfort", "support"),
+    "conflicts": ("argue", "fight", "oppose", "resent", "blame", "distrust", "confront", "attack"),
+}
+# Keyword stem -> the stats and relationship kinds it scores
+KEYWORD_KINDS = defaultdict(tuple)
+for kind, stems in {**STAT_KEYWORDS, **RELATIONSHIP_KEYWORDS}.items():
+    for stem in stems:
+        KEYWORD_KINDS[stem] += (kind,)
+# Lower-cased full or first name -> full name
+NAME_LOOKUP = {n.lower(): name for name in CHARACTER_INFO for n in (name, name.split()[0])}
+# Names, keyword words (stem plus any ending) and sentence breaks, found in one scan
+TRACKING_PATTERN = re.compile(
+    r"\b(" + "|".join(map(re.escape, sorted(NAME_LOOKUP, key=len, reverse=True))) + r")\b"
+    r"|\b(" + "|".join(sorted(KEYWORD_KINDS, key=len, reverse=True)) + r")\w*"
+    r"|[.!?\n]+",
+    re.IGNORECASE
+)
+
+def extract_interactions(text: str):
+    """Scan ``text`` once for the stat and relationship hits within each sentence.
+
+    A stat counts for a character named before one of its keywords; a
+    relationship counts for (name1, name2) when name1 comes before the
+    keyword and name2 after it. Returns sets of (stat, name) and
+    (kind, name1, name2), each hit counted once per text.
+    """
+    stat_hits = set()
+    pair_hits = set()
+    seen = []  # Characters named so far in the sentence
+    sources = defaultdict(set)  # Relationship kind -> characters named before its keyword
+    for match in TRACKING_PATTERN.finditer(text):
+        name, stem = match.group(1), match.group(2)
+        if name:
+            name = NAME_LOOKUP[name.lower()]
+            for kind, names in sources.items():
+                pair_hits.update((kind, source, name) for source in names if source != name)
+            seen.append(name)
+        elif stem:
+            for kind in KEYWORD_KINDS[stem.lower()]:
+                if kind in STAT_KEYWORDS:
+                    stat_hits.update((kind, n) for n in seen)
+                else:
+                    sources[kind].update(seen)
+        else:
+            seen = []
+            sources = defaultdict(set)
+    return stat_hits, pair_hits
+
 def auto_track_stats(text: str, g):
-    if not text or "[ERROR:" in text or not active_game:
+    if not text or "[ERROR:" in text or g.terminated:
         return
-    for name in CHARACTER_INFO:
-        if re.search(rf"{name}.*(help|assist|protect|save|heal|aid|support)", text, re.IGNORECASE):
-            g.stats["helped"][name] += 1
-        if re.search(rf"{name}.*(improvise|solve|navigate|strategize|craft|build|repair|scavenge|plan)", text, re.IGNORECASE):
-            g.stats["resourceful"][name] += 1
-        if re.search(rf"{name}.*(betray|attack|abandon|sabotage|threaten|steal|harm|endanger)", text, re.IGNORECASE):
-            g.stats["sinister"][name] += 1
-        if re.search(rf"{name}.*(grace|sacrifice|honor|calm|composure|dignity|bravery|courage)", text, re.IGNORECASE):
-            g.stats["dignified"][name] += 1
+    stat_hits, _ = extract_interactions(text)
+    for stat, name in stat_hits:
+        g.stats[stat][name] += 1
 
 def auto_track_relationships(text: str, g):
-    if not text or "[ERROR:" in text or not active_game:
+    if not text or "[ERROR:" in text or g.terminated:
         return
-    for name1 in g.alive:
-        for name2 in g.alive:
-            if name1 == name2:
-                continue
-            if re.search(rf"{name1}.*(share|nod|exchange|trust|help|protect|comfort|support).+{name2}", text, re.IGNORECASE):
-                g.stats["bonds"][(name1, name2)] += 1
-            if re.search(rf"{name1}.*(argue|fight|oppose|resent|blame|distrust|confront|attack).+{name2}", text, re.IGNORECASE):
-                g.stats["conflicts"][(name1, name2)] += 1
-
-def get_leaderboard_stats():
-    try:
-        conn = sqlite3.connect('zombie_leaderboard.db')
-        c = conn.cursor()
-        c.execute('''SELECT character_name, COUNT(*) as wins
-                    FROM character_stats
-                    WHERE survived = 1
-                    GROUP BY character_name
-                    ORDER BY wins DESC
-                    LIMIT 3''')
-        wins = c.fetchall()
-        c.execute('''SELECT character_name, COUNT(*) as early_deaths
-                    FROM character_stats
-                    WHERE death_round = 1
-                    GROUP BY character_name
-                    ORDER BY early_deaths DESC''')
-        early_deaths = c.fetchall()
-        c.execute('''SELECT character1, character2, SUM(bond_strength) as total_bond
-                    FROM relationships
-                    WHERE bond_strength > 0
-                    GROUP BY character1, character2
-                    ORDER BY total_bond DESC
-                    LIMIT 3''')
-        bonds = c.fetchall()
-        c.execute('''SELECT character1, character2, SUM(conflict_strength) as total_conflict
-                    FROM relationships
-                    WHERE conflict_strength > 0
-                    GROUP BY character1, character2
-                    ORDER BY total_conflict DESC
-                    LIMIT 3''')
-        conflicts = c.fetchall()
-        conn.close()
-        return {
-            "wins": wins,
-            "early_deaths": early_deaths,
-            "bonds": bonds,
-            "conflicts": conflicts
-        }
-    except Exception as e:
-        logger.error(f"Error getting leaderboard stats: {e}")
-        return None
+    _, pair_hits = extract_interactions(text)
+    for kind, name1, name2 in pair_hits:
+        if name1 in g.alive and name2 in g.alive:
+            g.stats[kind][(name1, name2)] += 1
 
-async def start_game_async(user_id: int, game_mode: str = "player", resume=False, speed: float = 1.0):
-    global active_game, current_speed
+async def start_game_async(user_id: int, game_mode: str = "player", resume=False, speed: float = 1.0, channel_id: int = None):
+    """Create (or resume) a game and register it for ``channel_id``; None on failure."""
     if resume:
-        active_game = GameState.load(user_id)
-        if active_game:
-            current_speed = active_game.game_speed
-            return True
-        return False
-    active_game = GameState(user_id, game_mode)
-    current_speed = speed
-    active_game.game_speed = speed
-    active_game.story_seed = await generate_unique_setting()
-    active_game.story_context = f"Setting: {active_game.story_seed}\n"
-    return True
+        g = GameState.load(user_id)
+        if not g:
+            return None
+        g.channel_id = channel_id or g.channel_id
+    else:
+        g = GameState(user_id, game_mode, channel_id)
+        g.game_speed = speed
+        g.story_seed = await generate_unique_setting()
+        g.story_context = f"Setting: {g.story_seed}\n"
+    active_games[g.channel_id] = g
+    return g
 
 async def generate_unique_setting():
-    if not OPENROUTER_API_KEYS:
+    if not key_pool:
         return "Abandoned high school during a zombie outbreak."
     messages = [
         {"role": "system", "content": "You are a horror storyteller."},
@@ -1316,39 +1695,75 @@ async def generate_unique_setting():
     ]
     return await generate_ai_text(messages)
 
-async def stream_bullets_in_message(channel: discord.TextChannel, bullets: list, delay_type: str = "scene"):
-    delay = get_delay(delay_type)
-    bullets = [b for b in bullets if b.strip() and b.strip() != "•"]
-    if not bullets:
+def count_rest_call(g):
+    if g is not None:
+        g.rest_calls += 1
+
+def clean_bullets(bullets: list) -> list:
+    """Drop empty bullets and end the rest with punctuation."""
+    lines = []
+    for bullet in bullets:
+        cleaned = bullet.strip()
+        if not cleaned or cleaned == "•":
+            continue
+        if not cleaned.endswith(('.', '!', '?', '"', '…', '...')):
+            cleaned += "."
+        lines.append(cleaned)
+    return lines
+
+async def stream_bullets_in_message(channel: discord.TextChannel, bullets: list, delay_type: str = "scene", g=None, header: str = None):
+    """Reveal ``bullets`` under ``header`` in one message, one bullet per ``delay_type`` delay.
+
+    The header and first bullet go out in the initial send. When the channel's
+    edit budget is spent, the edit waits and shows every bullet that came due
+    meanwhile, so pacing follows SPEED_SETTINGS without hitting 429s.
+    """
+    delay = get_delay(delay_type, g)
+    lines = clean_bullets(bullets)
+    if not lines:
+        if header:
+            await channel.send(header)
+            count_rest_call(g)
         return
+    budget = edit_budgets[channel.id]
+    body = [header] if header else []
+    body.append(lines[0])
+    shown = 1
     try:
-        msg = await channel.send("...")
+        msg = await channel.send("\n".join(body))
+        count_rest_call(g)
     except Exception as e:
         logger.warning(f"Initial message failed: {e}")
-        content = "\n".join(bullets)
-        await channel.send(content)
+        await channel.send("\n".join(([header] if header else []) + lines))
         return
-    content = ""
-    for i, bullet in enumerate(bullets):
-        cleaned = bullet.strip()
-        if not cleaned:
-            continue
-        if not cleaned.endswith(('.', '!', '?', '"', '…', '...')):
-            cleaned += "."
-        content += f"{cleaned}\n\n"
+    start = time.monotonic()
+    while shown < len(lines):
+        await asyncio.sleep(max(start + shown * delay - time.monotonic(), budget.wait_time()))
+        # Every bullet due by now goes out in this edit
+        due = int((time.monotonic() - start) / delay) + 1 if delay > 0 else len(lines)
+        new_lines = lines[shown:max(shown + 1, min(due, len(lines)))]
+        content = "\n\n".join(body[1 if header else 0:] + new_lines)
         try:
-            await msg.edit(content=content.strip())
+            if len(header or "") + len(content) + 1 > MESSAGE_LIMIT:
+                # Full message; carry on in a new one
+                body = list(new_lines)
+                header = None
+                msg = await channel.send("\n\n".join(body))
+            else:
+                body.extend(new_lines)
+                await msg.edit(content=f"{header}\n{content}" if header else content)
+                budget.spend()
+            count_rest_call(g)
         except Exception as e:
-            logger.warning(f"Edit failed during bullet stream: {cleaned} — {e}")
-            remaining = bullets[i:]
-            if remaining:
-                await channel.send("\n".join(remaining))
+            logger.warning(f"Edit failed during bullet stream: {new_lines[0]} — {e}")
+            await channel.send("\n".join(lines[shown:]))
             return
-        await asyncio.sleep(delay)
+        shown += len(new_lines)
+    await asyncio.sleep(delay)
 
-async def countdown_message(message: discord.Message, seconds: int, prefix: str = "", final_text: str = None):
+async def countdown_message(message: discord.Message, seconds: int, prefix: str = "", final_text: str = None, g=None):
     for i in range(seconds, 0, -1):
-        if active_game and active_game.terminated:
+        if g is not None and g.terminated:
             return
         try:
             await message.edit(content=f"{prefix} {i}")
@@ -1362,17 +1777,6 @@ async def countdown_message(message: discord.Message, seconds: int, prefix: str
         except Exception as e:
             logger.warning(f"Final edit failed: {e}")
 
-async def tally_votes(message, votes_cast):
-    votes = {"1️⃣": 0, "2️⃣": 0}
-    for reaction in message.reactions:
-        if reaction.emoji in votes:
-            users = [user async for user in reaction.users()]
-            for user in users:
-                if not user.bot and user.id not in votes_cast:
-                    votes[reaction.emoji] += 1
-                    votes_cast.add(user.id)
-    return votes
-
 # --- Cog Setup ---
 async def setup(bot: commands.Bot):
     await bot.add_cog(ZombieGame(bot))
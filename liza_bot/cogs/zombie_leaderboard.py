@@ -0,0 +1,178 @@
+import logging
+from collections import defaultdict
+from typing import Iterable, Optional
+from cogs.sqlite_executor import SQLiteExecutor
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_DB = "zombie_leaderboard.db"
+TOP_WINS = 3  # Rows the leaderboard embed shows per section
+TOP_EARLY_DEATHS = 5
+TOP_PAIRS = 3
+
+
+class LeaderboardDB(SQLiteExecutor):
+    """Zombie game results, stored in SQLite off the event loop.
+
+    ``character_totals`` and ``pair_totals`` hold the leaderboard aggregates.
+    They are updated in the same transaction as the raw rows, so reads are
+    top-k index lookups; ``rebuild_totals`` recomputes them from scratch.
+    """
+
+    def __init__(self, db_path: str = LEADERBOARD_DB):
+        super().__init__(db_path, "zombie-leaderboard")
+
+    def init_db(self):
+        c = self.conn.cursor()
+        c.execute('''CREATE TABLE IF NOT EXISTS games
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      initiator INTEGER,
+                      winner TEXT,
+                      completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+        c.execute('''CREATE TABLE IF NOT EXISTS character_stats
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      character_name TEXT,
+                      game_id INTEGER,
+                      death_round INTEGER,
+                      survived BOOLEAN,
+                      FOREIGN KEY (game_id) REFERENCES games (id))''')
+        c.execute('''CREATE TABLE IF NOT EXISTS relationships
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      character1 TEXT,
+                      character2 TEXT,
+                      game_id INTEGER,
+                      bond_strength INTEGER DEFAULT 0,
+                      conflict_strength INTEGER DEFAULT 0,
+                      FOREIGN KEY (game_id) REFERENCES games (id))''')
+        c.execute('''CREATE INDEX IF NOT EXISTS idx_character_stats_survived
+                     ON character_stats (survived, character_name)''')
+        c.execute('''CREATE INDEX IF NOT EXISTS idx_character_stats_death_round
+                     ON character_stats (death_round)''')
+        c.execute('''CREATE INDEX IF NOT EXISTS idx_relationships_pair
+                     ON relationships (character1, character2)''')
+        # --- Aggregates ---
+        c.execute('''CREATE TABLE IF NOT EXISTS character_totals
+                     (character_name TEXT PRIMARY KEY,
+                      wins INTEGER NOT NULL DEFAULT 0,
+                      early_deaths INTEGER NOT NULL DEFAULT 0)''')
+        c.execute('''CREATE TABLE IF NOT EXISTS pair_totals
+                     (character1 TEXT NOT NULL,
+                      character2 TEXT NOT NULL,
+                      total_bond INTEGER NOT NULL DEFAULT 0,
+                      total_conflict INTEGER NOT NULL DEFAULT 0,
+                      PRIMARY KEY (character1, character2))''')
+        c.execute("CREATE INDEX IF NOT EXISTS idx_character_totals_wins ON character_totals (wins)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_character_totals_early_deaths ON character_totals (early_deaths)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_pair_totals_bond ON pair_totals (total_bond)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_pair_totals_conflict ON pair_totals (total_conflict)")
+        self.conn.commit()
+        # Databases from before the aggregates existed get them filled once
+        has_totals = c.execute("SELECT 1 FROM character_totals LIMIT 1").fetchone()
+        has_games = c.execute("SELECT 1 FROM character_stats LIMIT 1").fetchone()
+        if has_games and not has_totals:
+            self._rebuild_totals()
+
+    # --- Writes ---
+    def _save_game(self, initiator: int, winner: Optional[str],
+                   character_rows: list, relationship_rows: list):
+        conn = self._connect()
+        with conn:  # One transaction for the whole game
+            c = conn.execute("INSERT INTO games (initiator, winner) VALUES (?, ?)", (initiator, winner))
+            game_id = c.lastrowid
+            conn.executemany('''INSERT INTO character_stats
+                                (character_name, game_id, death_round, survived)
+                                VALUES (?, ?, ?, ?)''',
+                             [(name, game_id, death_round, survived)
+                              for name, death_round, survived in character_rows])
+            conn.executemany('''INSERT INTO relationships
+                                (character1, character2, game_id, bond_strength, conflict_strength)
+                                VALUES (?, ?, ?, ?, ?)''',
+                             [(char1, char2, game_id, bond, conflict)
+                              for char1, char2, bond, conflict in relationship_rows])
+            conn.executemany('''INSERT INTO character_totals (character_name, wins, early_deaths)
+                                VALUES (?, ?, ?)
+                                ON CONFLICT (character_name) DO UPDATE SET
+                                    wins = wins + excluded.wins,
+                                    early_deaths = early_deaths + excluded.early_deaths''',
+                             [(name, int(bool(survived)), int(death_round == 1))
+                              for name, death_round, survived in character_rows
+                              if survived or death_round == 1])
+            pairs = defaultdict(lambda: [0, 0])
+            for char1, char2, bond, conflict in relationship_rows:
+                pairs[(char1, char2)][0] += max(bond, 0)
+                pairs[(char1, char2)][1] += max(conflict, 0)
+            conn.executemany('''INSERT INTO pair_totals (character1, character2, total_bond, total_conflict)
+                                VALUES (?, ?, ?, ?)
+                                ON CONFLICT (character1, character2) DO UPDATE SET
+                                    total_bond = total_bond + excluded.total_bond,
+                                    total_conflict = total_conflict + excluded.total_conflict''',
+                             [(char1, char2, bond, conflict) for (char1, char2), (bond, conflict) in pairs.items()])
+
+    async def save_game(self, initiator: int, winner: Optional[str],
+                        character_rows: Iterable[tuple], relationship_rows: Iterable[tuple]):
+        """Record a finished game.
+
+        ``character_rows`` are (name, death_round, survived) and
+        ``relationship_rows`` are (char1, char2, bond_strength, conflict_strength).
+        """
+        try:
+            await self._run(self._save_game, initiator, winner, list(character_rows), list(relationship_rows))
+            logger.info("Game results saved to leaderboard")
+        except Exception as e:
+            logger.error(f"Error saving to leaderboard: {e}")
+
+    # --- Reads ---
+    def _get_stats(self) -> dict:
+        c = self._connect().cursor()
+        wins = c.execute('''SELECT character_name, wins FROM character_totals
+                            WHERE wins > 0 ORDER BY wins DESC, character_name LIMIT ?''', (TOP_WINS,)).fetchall()
+        early_deaths = c.execute('''SELECT character_name, early_deaths FROM character_totals
+                                    WHERE early_deaths > 0 ORDER BY early_deaths DESC, character_name LIMIT ?''',
+                                 (TOP_EARLY_DEATHS,)).fetchall()
+        bonds = c.execute('''SELECT character1, character2, total_bond FROM pair_totals
+                             WHERE total_bond > 0 ORDER BY total_bond DESC, character1, character2 LIMIT ?''', (TOP_PAIRS,)).fetchall()
+        conflicts = c.execute('''SELECT character1, character2, total_conflict FROM pair_totals
+                                 WHERE total_conflict > 0 ORDER BY total_conflict DESC, character1, character2 LIMIT ?''',
+                              (TOP_PAIRS,)).fetchall()
+        return {
+            "wins": wins,
+            "early_deaths": early_deaths,
+            "bonds": bonds,
+            "conflicts": conflicts
+        }
+
+    async def get_stats(self) -> Optional[dict]:
+        try:
+            return await self._run(self._get_stats)
+        except Exception as e:
+            logger.error(f"Error getting leaderboard stats: {e}")
+            return None
+
+    # --- Maintenance ---
+    def _rebuild_totals(self) -> int:
+        """Recompute both aggregate tables from the raw rows; returns the game count."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM character_totals")
+            conn.execute("DELETE FROM pair_totals")
+            conn.execute('''INSERT INTO character_totals (character_name, wins, early_deaths)
+                            SELECT character_name,
+                                   SUM(CASE WHEN survived = 1 THEN 1 ELSE 0 END),
+                                   SUM(CASE WHEN death_round = 1 THEN 1 ELSE 0 END)
+                            FROM character_stats
+                            GROUP BY character_name''')
+            conn.execute('''INSERT INTO pair_totals (character1, character2, total_bond, total_conflict)
+                            SELECT character1, character2,
+                                   SUM(CASE WHEN bond_strength > 0 THEN bond_strength ELSE 0 END),
+                                   SUM(CASE WHEN conflict_strength > 0 THEN conflict_strength ELSE 0 END)
+                            FROM relationships
+                            GROUP BY character1, character2''')
+        games = conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+        logger.info(f"Rebuilt leaderboard totals from {games} games")
+        return games
+
+    async def rebuild_totals(self) -> int:
+        return await self._run(self._rebuild_totals)
+
+
+leaderboard = LeaderboardDB()
@@ -0,0 +1,33 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Tests import the bot's modules the way main.py does: ``from cogs import ...``
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.fakes import FakeBot, StubLLM, install_stand_ins  # noqa: E402
+
+install_stand_ins()
+
+
+@pytest.fixture
+def zombie(monkeypatch, tmp_path):
+    """zombie_game with no pacing delays, saves under tmp_path and a StubLLM.
+
+    Yields the module as ``zombie.game``, a cog as ``zombie.cog`` and the stub
+    as ``zombie.llm``.
+    """
+    from cogs import streaming, zombie_game
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(streaming, "EDIT_WINDOW", 0)
+    monkeypatch.setattr(zombie_game, "SPEED_SETTINGS", {
+        speed: {name: 0 for name in delays} for speed, delays in zombie_game.SPEED_SETTINGS.items()
+    })
+    monkeypatch.setattr(zombie_game, "active_games", {})
+    llm = StubLLM()
+    monkeypatch.setattr(zombie_game, "generate_ai_text", llm)
+    yield SimpleNamespace(game=zombie_game, cog=zombie_game.ZombieGame(FakeBot()), llm=llm)
+    zombie_game.SAVE_EXECUTOR.submit(lambda: None).result()  # Let queued saves land before tmp_path goes
@@ -0,0 +1,172 @@
+"""Test doubles for running cogs without Discord or OpenRouter.
+
+``install_stand_ins`` registers minimal discord, httpx and dotenv modules,
+but only for the ones that are not installed, so the real libraries are
+used whenever they are available. The fake channel and message record
+what a cog sends instead of talking to Discord.
+"""
+import asyncio
+import importlib.util
+import os
+import sys
+import types
+
+
+def _decorator(*args, **kwargs):
+    return lambda func: func
+
+
+def _httpx_module() -> types.ModuleType:
+    httpx = types.ModuleType("httpx")
+
+    class HTTPError(Exception):
+        pass
+
+    class TimeoutException(HTTPError):
+        pass
+
+    class HTTPStatusError(HTTPError):
+        def __init__(self, message="", *, request=None, response=None):
+            super().__init__(message)
+            self.request = request
+            self.response = response
+
+    class AsyncClient:
+        def __init__(self, **kwargs):
+            self.is_closed = False
+
+        async def aclose(self):
+            self.is_closed = True
+
+    httpx.HTTPError = HTTPError
+    httpx.TimeoutException = TimeoutException
+    httpx.HTTPStatusError = HTTPStatusError
+    httpx.AsyncClient = AsyncClient
+    httpx.Limits = lambda **kwargs: None
+    httpx.Timeout = lambda *args, **kwargs: None
+    return httpx
+
+
+def _discord_modules() -> dict:
+    discord = types.ModuleType("discord")
+    for name in ("Interaction", "TextChannel", "Thread", "Message", "Guild", "Member",
+                 "RawReactionActionEvent", "RawMessageDeleteEvent", "RawMessageUpdateEvent"):
+        setattr(discord, name, object)
+    discord.Embed = object
+    discord.utils = types.SimpleNamespace(get=lambda iterable, **attrs: None)
+    discord.ButtonStyle = types.SimpleNamespace(
+        gray=1, grey=1, green=1, red=1, blurple=1, secondary=1, danger=1
+    )
+
+    class View:
+        def __init__(self, *args, **kwargs):
+            pass
+
+    ui = types.ModuleType("discord.ui")
+    ui.View = View
+    ui.Button = object
+    ui.button = _decorator
+    discord.ui = ui
+
+    class Cog:
+        listener = staticmethod(_decorator)
+
+    ext = types.ModuleType("discord.ext")
+    commands = types.ModuleType("discord.ext.commands")
+    commands.Cog = Cog
+    commands.Bot = object
+    commands.command = _decorator
+    ext.commands = commands
+    discord.ext = ext
+
+    app_commands = types.ModuleType("discord.app_commands")
+    app_commands.command = _decorator
+    app_commands.describe = _decorator
+    app_commands.default_permissions = _decorator
+    discord.app_commands = app_commands
+
+    return {
+        "discord": discord, "discord.ui": ui, "discord.ext": ext,
+        "discord.ext.commands": commands, "discord.app_commands": app_commands,
+    }
+
+
+def install_stand_ins():
+    """Register stand-ins for whichever of discord, httpx and dotenv are missing."""
+    if importlib.util.find_spec("httpx") is None:
+        sys.modules.setdefault("httpx", _httpx_module())
+    if importlib.util.find_spec("dotenv") is None:
+        dotenv = types.ModuleType("dotenv")
+        dotenv.load_dotenv = lambda *args, **kwargs: False
+        sys.modules.setdefault("dotenv", dotenv)
+    if importlib.util.find_spec("discord") is None:
+        for name, module in _discord_modules().items():
+            sys.modules.setdefault(name, module)
+    # The shared key pool is built from the environment on import
+    os.environ.setdefault("OPENROUTER_API_KEY_1", "sk-test-key-0001")
+
+
+class FakeMessage:
+    def __init__(self, channel, message_id: int, content=None):
+        self.channel = channel
+        self.id = message_id
+        self.content = content
+        self.edits = 0
+
+    async def edit(self, **kwargs):
+        self.edits += 1
+        if "content" in kwargs:
+            self.content = kwargs["content"]
+
+    async def add_reaction(self, emoji):
+        pass
+
+    async def delete(self):
+        pass
+
+
+class FakeChannel:
+    """A text channel that keeps a count of what was sent to it."""
+
+    def __init__(self, channel_id: int, guild_id: int = 1):
+        self.id = channel_id
+        self.guild = types.SimpleNamespace(id=guild_id, emojis=[])
+        self.sent = 0
+
+    async def send(self, content=None, **kwargs):
+        self.sent += 1
+        return FakeMessage(self, self.id * 100_000 + self.sent, content)
+
+
+class FakeBot:
+    def get_channel(self, channel_id):
+        return None
+
+
+class StubLLM:
+    """Stands in for zombie_game.generate_ai_text with short canned replies.
+
+    Nobody is reported dead, so a game lasts as long as the test wants.
+    ``calls`` counts requests per game.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = {}
+
+    async def __call__(self, messages, temperature=0.8, usage=None, g=None, stream=None):
+        if stream is not None:
+            stream.finish()
+        self.calls[id(g)] = self.calls.get(id(g), 0) + 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        prompt = messages[-1]["content"]
+        if "DIED:" in prompt:
+            return "DIED: None"
+        if "exactly 2 distinct choices" in prompt:
+            return "1. Run for the van.\n2. Hide in the pharmacy."
+        return "• Shaun runs ahead.\n• Addison covers the door."
+
+    @property
+    def total(self) -> int:
+        return sum(self.calls.values())
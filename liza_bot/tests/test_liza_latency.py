@@ -0,0 +1,111 @@
+"""The event loop keeps running while LizaAI waits on a slow model."""
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+
+from cogs import liza_ai
+
+MODEL_DELAY = 0.5  # Seconds the fake OpenRouter takes to answer
+TICK = 0.01
+MAX_LAG = 0.1  # A blocking call would stall the loop for the whole MODEL_DELAY
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, data: dict):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+    async def aread(self):
+        return b""
+
+    async def aiter_lines(self):
+        for delta in ("Hee", " hee", "!"):
+            await asyncio.sleep(MODEL_DELAY / 3)
+            yield "data: " + json.dumps({"choices": [{"delta": {"content": delta}}]})
+        yield "data: [DONE]"
+
+
+class SlowClient:
+    """An OpenRouter that answers after MODEL_DELAY without holding the loop."""
+
+    async def post(self, url, **kwargs):
+        await asyncio.sleep(MODEL_DELAY)
+        return FakeResponse({"choices": [{"message": {"content": "Hee hee!"}}]})
+
+    @asynccontextmanager
+    async def stream(self, method, url, **kwargs):
+        yield FakeResponse({})
+
+
+class BlockingClient(SlowClient):
+    """The old behaviour: a synchronous request inside the event loop."""
+
+    async def post(self, url, **kwargs):
+        time.sleep(MODEL_DELAY)
+        return FakeResponse({"choices": [{"message": {"content": "Hee hee!"}}]})
+
+
+async def max_loop_lag(coro) -> tuple:
+    """Run ``coro`` while a ticker measures how late the loop wakes it up."""
+    lag = 0.0
+    running = True
+
+    async def ticker():
+        nonlocal lag
+        while running:
+            start = time.monotonic()
+            await asyncio.sleep(TICK)
+            lag = max(lag, time.monotonic() - start - TICK)
+
+    probe = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    try:
+        result = await coro
+    finally:
+        running = False
+        await probe
+    return result, lag
+
+
+async def reply_text(reply) -> str:
+    if isinstance(reply, liza_ai.TextStream):
+        async for text in reply.changes():
+            pass
+        return reply.text
+    return reply
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_loop_stays_responsive_during_model_call(monkeypatch, streaming):
+    monkeypatch.setattr(liza_ai, "LIZA_STREAMING", streaming)
+    cog = liza_ai.LizaAI(None)
+    cog.http = SlowClient()
+
+    async def ask():
+        return await reply_text(await cog.fetch_liza_reply("Liza, what's for lunch?"))
+
+    start = time.monotonic()
+    reply, lag = asyncio.run(max_loop_lag(ask()))
+    assert reply == "Hee hee!"
+    assert time.monotonic() - start >= MODEL_DELAY
+    assert lag < MAX_LAG
+
+
+def test_probe_catches_a_blocking_client(monkeypatch):
+    monkeypatch.setattr(liza_ai, "LIZA_STREAMING", False)
+    cog = liza_ai.LizaAI(None)
+    cog.http = BlockingClient()
+    reply, lag = asyncio.run(max_loop_lag(cog.fetch_liza_reply("Liza?")))
+    assert reply == "Hee hee!"
+    assert lag >= MODEL_DELAY * 0.8
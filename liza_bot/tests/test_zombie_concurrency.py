@@ -0,0 +1,50 @@
+"""Several zombie games share one event loop without sharing state."""
+import asyncio
+import time
+
+from tests.fakes import FakeChannel
+
+GAMES = 8
+ROUNDS = 3
+LLM_DELAY = 0.05  # Seconds per stub LLM call
+
+
+async def play(zombie, channel_id: int):
+    game = zombie.game.GameState(channel_id, "auto", channel_id)
+    zombie.game.active_games[channel_id] = game
+    channel = FakeChannel(channel_id)
+    for _ in range(ROUNDS):
+        assert await zombie.cog.run_round(channel, game)
+    return game, channel
+
+
+def keep_everyone_alive(zombie, monkeypatch):
+    async def show_deaths(channel, g, rounds):
+        return True
+    monkeypatch.setattr(zombie.cog, "show_deaths", show_deaths)
+
+
+def test_games_run_concurrently(zombie, monkeypatch):
+    keep_everyone_alive(zombie, monkeypatch)
+    zombie.llm.delay = LLM_DELAY
+
+    start = time.monotonic()
+    single, single_channel = asyncio.run(play(zombie, 1))
+    one_game = time.monotonic() - start
+
+    async def many():
+        return await asyncio.gather(*(play(zombie, 100 + i) for i in range(GAMES)))
+
+    start = time.monotonic()
+    results = asyncio.run(many())
+    all_games = time.monotonic() - start
+
+    # Concurrent games overlap their LLM waits instead of queueing behind one another
+    assert all_games < one_game * 2
+    games = [game for game, _ in results]
+    assert len({id(game) for game in games}) == GAMES
+    assert all(zombie.game.active_games[100 + i] is game for i, game in enumerate(games))
+    for game, channel in results:
+        assert game.round == ROUNDS
+        assert channel.sent == single_channel.sent  # Only its own game's messages
+        assert zombie.llm.calls[id(game)] == zombie.llm.calls[id(single)]
@@ -0,0 +1,65 @@
+"""Long auto games keep memory flat, and a round resumes from its save."""
+import asyncio
+import resource
+
+from tests.fakes import FakeChannel
+
+ROUNDS = 1000
+WARMUP_ROUNDS = 100
+MAX_RSS_GROWTH_KB = 2 * 1024
+
+
+def keep_everyone_alive(zombie, monkeypatch):
+    async def show_deaths(channel, g, rounds):
+        return True
+    monkeypatch.setattr(zombie.cog, "show_deaths", show_deaths)
+
+
+def max_rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def test_thousand_auto_rounds_keep_rss_flat(zombie, monkeypatch):
+    keep_everyone_alive(zombie, monkeypatch)
+    game = zombie.game.GameState(1, "auto", 5)
+    zombie.game.active_games[5] = game
+    channel = FakeChannel(5)
+
+    async def play():
+        baseline = None
+        for played in range(1, ROUNDS + 1):
+            assert await zombie.cog.run_round(channel, game)
+            if played == WARMUP_ROUNDS:
+                baseline = max_rss_kb()
+        return baseline
+
+    baseline = asyncio.run(play())
+    assert game.round == ROUNDS
+    assert max_rss_kb() - baseline < MAX_RSS_GROWTH_KB
+
+
+def test_interrupted_round_resumes_from_save(zombie):
+    game = zombie.game.GameState(2, "auto", 6)
+    zombie.game.active_games[6] = game
+
+    async def crash(channel, g, rounds):
+        raise RuntimeError("bot restarted")
+
+    zombie.cog.show_vote = crash
+    try:
+        asyncio.run(zombie.cog.run_round(FakeChannel(6), game))
+    except RuntimeError:
+        pass
+    del zombie.cog.show_vote
+    zombie.game.SAVE_EXECUTOR.submit(lambda: None).result()
+
+    resumed = zombie.game.GameState.load(2)
+    assert resumed.round == 1
+    assert resumed.round_state["shown"] == ["scene", "health", "dynamics", "dilemma", "choices"]
+    assert {"scene", "health", "dilemma", "choices"} <= set(resumed.round_state["results"])
+
+    assert asyncio.run(zombie.cog.run_round(FakeChannel(6), resumed))
+    # Only the outcome and the death analysis were left to generate
+    assert zombie.llm.calls[id(resumed)] == 2
+    assert resumed.round_state == {}
+    resumed.delete_save()